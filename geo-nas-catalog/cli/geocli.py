@@ -1,11 +1,15 @@
 """Typer-based command line interface for geo-nas-catalog."""
 from __future__ import annotations
 
-import json
+from itertools import islice
+import mmap
+import os
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
+import orjson
 import typer
+from pydantic import TypeAdapter
 
 import sys
 
@@ -14,15 +18,51 @@ SRC_ROOT = PROJECT_ROOT / "src"
 if str(SRC_ROOT) not in sys.path:
     sys.path.insert(0, str(SRC_ROOT))
 
-from catalog import CatalogEntry, CatalogScanner, ScanConfig  # type: ignore  # noqa: E402
-from catalog.schema import CatalogSummary  # type: ignore  # noqa: E402
-from catalog.metadata import CatalogSummary  # type: ignore  # noqa: E402
-from ingest import load_dataset  # type: ignore  # noqa: E402
-from plot import apply_nature_style, export_figure  # type: ignore  # noqa: E402
+from catalog import (  # type: ignore  # noqa: E402
+    CatalogEntry,
+    CatalogScanner,
+    CatalogSummary,
+    CatalogWriter,
+    ScanConfig,
+)
 from utils.logging import configure_logging  # type: ignore  # noqa: E402
 
 app = typer.Typer(add_completion=False)
 
+_VALIDATE_CHUNK = 10_000
+_ENTRY_LIST: TypeAdapter[List[CatalogEntry]] = TypeAdapter(List[CatalogEntry])
+
+
+def _read_catalog(catalog_path: Path) -> Iterator[Dict[str, Any]]:
+    """Yield every JSONL record of ``catalog_path`` as a plain dictionary.
+
+    The file is memory-mapped and split on newline bytes, so lines are handed to
+    orjson without being copied into a ``str`` first.
+    """
+
+    with catalog_path.open("rb") as handle:
+        if os.fstat(handle.fileno()).st_size == 0:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            end = len(view)
+            pos = 0
+            while pos < end:
+                newline = view.find(b"\n", pos)
+                if newline == -1:
+                    newline = end
+                line = view[pos:newline]
+                pos = newline + 1
+                if line.strip():
+                    yield orjson.loads(line)
+
+
+def _iter_entries(catalog_path: Path) -> Iterator[CatalogEntry]:
+    """Yield validated catalog entries, validating records in batches."""
+
+    records = _read_catalog(catalog_path)
+    while chunk := list(islice(records, _VALIDATE_CHUNK)):
+        yield from _ENTRY_LIST.validate_python(chunk)
+
 
 def _resolve_root(path: Path) -> Path:
     if not path.exists():
@@ -39,26 +79,48 @@ def main(verbose: bool = typer.Option(False, "--verbose", help="Enable debug log
 def scan(
     root: Path = typer.Argument(..., help="Root directory to scan."),
     output: Path = typer.Option(Path("catalog/catalog.jsonl"), help="Path to JSONL output."),
+    parquet: Optional[Path] = typer.Option(
+        None, help="Also write the catalog to this Parquet file."
+    ),
+    checksums: bool = typer.Option(
+        False, "--checksums", help="Record a SHA1 checksum for every file."
+    ),
 ) -> None:
     root = _resolve_root(root)
     scanner = CatalogScanner()
-    config = ScanConfig(root=root)
-    entries: List[CatalogEntry] = list(scanner.scan(config))
-    output.parent.mkdir(parents=True, exist_ok=True)
-    with output.open("w", encoding="utf-8") as handle:
-        for entry in entries:
-            handle.write(entry.json())
-            handle.write("\n")
-    typer.echo(f"Wrote {len(entries)} entries to {output}")
+    config = ScanConfig(root=root, compute_checksums=checksums)
+    with CatalogWriter(output, parquet_path=parquet) as writer:
+        for batch in scanner.scan_batched(config):
+            writer.extend(batch)
+    count = writer.count
+    typer.echo(f"Wrote {count} entries to {output}")
 
 
 @app.command()
-def summarize(catalog_path: Path = typer.Argument(..., help="Catalog JSONL path.")) -> None:
+def summarize(
+    catalog_path: Path = typer.Argument(..., help="Catalog JSONL path."),
+    validate: bool = typer.Option(
+        False, "--validate", help="Validate every record against the CatalogEntry schema."
+    ),
+) -> None:
     if not catalog_path.exists():
         raise typer.BadParameter(f"Catalog {catalog_path} not found")
-    entries = [CatalogEntry.parse_raw(line) for line in catalog_path.read_text().splitlines()]
-    summary = CatalogSummary.from_entries(entries)
-    typer.echo(summary.json(indent=2))
+    if validate:
+        summary = CatalogSummary.from_entries(_iter_entries(catalog_path))
+        typer.echo(summary.model_dump_json(indent=2))
+        return
+    import numpy as np
+
+    sizes: List[int] = []
+    codes: List[int] = []
+    format_codes: Dict[str, int] = {}
+    for record in _read_catalog(catalog_path):
+        sizes.append(record["size_bytes"])
+        codes.append(format_codes.setdefault(record["format"], len(format_codes)))
+    summary = CatalogSummary.from_arrays(
+        np.asarray(sizes, dtype=np.int64), np.asarray(codes, dtype=np.int64), list(format_codes)
+    )
+    typer.echo(summary.model_dump_json(indent=2))
 
 
 @app.command()
@@ -66,17 +128,17 @@ def export(
     catalog_path: Path = typer.Argument(..., help="Catalog JSONL path."),
     parquet_path: Path = typer.Option(Path("catalog/catalog.parquet"), help="Output Parquet path."),
 ) -> None:
-    import pandas as pd
+    from catalog.parquet import write_parquet  # type: ignore
 
-    entries = [CatalogEntry.parse_raw(line).dict() for line in catalog_path.read_text().splitlines()]
-    df = pd.DataFrame(entries)
     parquet_path.parent.mkdir(parents=True, exist_ok=True)
-    df.to_parquet(parquet_path, index=False)
-    typer.echo(f"Exported catalog to {parquet_path}")
+    count = write_parquet(_read_catalog(catalog_path), parquet_path)
+    typer.echo(f"Exported {count} entries to {parquet_path}")
 
 
 @app.command()
 def examples(path: Path = typer.Argument(..., help="Example dataset to read.")) -> None:
+    from ingest import load_dataset  # type: ignore
+
     dataset = load_dataset(path)
     typer.echo(f"Loaded dataset type: {type(dataset).__name__}")
 
@@ -86,6 +148,8 @@ def plot_demo(output: Path = typer.Argument(Path("plots/demo"), help="Output bas
     import numpy as np
     import matplotlib.pyplot as plt
 
+    from plot import apply_nature_style, export_figure  # type: ignore
+
     with apply_nature_style():
         x = np.linspace(0, 10, 100)
         y = np.sin(x)
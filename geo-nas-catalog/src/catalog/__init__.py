@@ -2,10 +2,12 @@
 
 from .metadata import CatalogEntry, CatalogSummary
 from .scanner import CatalogScanner, ScanConfig
+from .writer import CatalogWriter
 
 __all__ = [
     "CatalogEntry",
     "CatalogSummary",
     "CatalogScanner",
+    "CatalogWriter",
     "ScanConfig",
 ]
@@ -0,0 +1,56 @@
+"""Array reductions backing :meth:`CatalogSummary.from_arrays`.
+
+Numba is an optional speed-up: when it is installed the reduction is JIT-compiled
+and split across threads, otherwise the equivalent NumPy kernels are used.
+"""
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import get_num_threads, njit, prange
+except ImportError:  # pragma: no cover - depends on the optional extra
+    njit = None
+
+
+def _aggregate_numpy(
+    sizes: np.ndarray, format_codes: np.ndarray, n_formats: int
+) -> Tuple[int, np.ndarray]:
+    return int(sizes.sum()), np.bincount(format_codes, minlength=n_formats)
+
+
+if njit is not None:
+
+    @njit(cache=True, parallel=True)
+    def _aggregate_jit(
+        sizes: np.ndarray, format_codes: np.ndarray, n_formats: int, n_threads: int
+    ) -> Tuple[int, np.ndarray]:  # pragma: no cover - compiled by numba
+        n = sizes.shape[0]
+        n_chunks = max(1, min(n, n_threads))
+        step = (n + n_chunks - 1) // n_chunks
+        totals = np.zeros(n_chunks, dtype=np.int64)
+        counts = np.zeros((n_chunks, n_formats), dtype=np.int64)
+        for chunk in prange(n_chunks):
+            for i in range(chunk * step, min((chunk + 1) * step, n)):
+                totals[chunk] += sizes[i]
+                counts[chunk, format_codes[i]] += 1
+        return totals.sum(), counts.sum(axis=0)
+
+
+def aggregate_sizes_and_formats(
+    sizes: np.ndarray, format_codes: np.ndarray, n_formats: int
+) -> Tuple[int, np.ndarray]:
+    """Return the total of ``sizes`` and a per-code histogram of ``format_codes``.
+
+    Raises ``ValueError`` when a code falls outside ``[0, n_formats)``; the compiled
+    kernel does not bounds-check its histogram writes.
+    """
+
+    if format_codes.size and (format_codes.min() < 0 or format_codes.max() >= n_formats):
+        raise ValueError(f"format codes must lie in [0, {n_formats})")
+    if njit is None:  # pragma: no cover - depends on the optional extra
+        return _aggregate_numpy(sizes, format_codes, n_formats)
+    total, counts = _aggregate_jit(sizes, format_codes, n_formats, get_num_threads())
+    return int(total), counts
@@ -1,12 +1,13 @@
 """File handlers for the catalog scanner."""
 
-from .base import FileHandler
+from .base import FileHandler, ScanContext
 from .netcdf import NetCDFHandler
 from .other import GenericHandler
 from .tabular import CSVHandler, ExcelHandler
 
 __all__ = [
     "FileHandler",
+    "ScanContext",
     "NetCDFHandler",
     "GenericHandler",
     "CSVHandler",
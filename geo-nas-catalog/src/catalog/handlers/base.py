@@ -1,22 +1,59 @@
 """Base protocol for file type handlers used by the catalog scanner."""
 from __future__ import annotations
 
+import os
 from abc import ABC, abstractmethod
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Any, FrozenSet, Iterable, Optional
 
 from ..metadata import CatalogEntry
 
 
+@dataclass(frozen=True, slots=True)
+class ScanContext:
+    """Per-file information the scanner already gathered while listing directories."""
+
+    stat_result: os.stat_result
+    suffix: Optional[str] = None
+
+
 class FileHandler(ABC):
     """Abstract base class for dataset handlers."""
 
-    formats: Iterable[str]
+    formats: Iterable[str] = ()
+    _suffixes: FrozenSet[str] = frozenset()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._suffixes = frozenset(suffix.lower() for suffix in cls.formats)
 
-    @abstractmethod
     def sniff(self, path: Path) -> bool:
-        """Return ``True`` if the handler can process the given path."""
+        """Return ``True`` if the handler can process the given path.
+
+        Handlers without declared ``formats`` accept any path.
+        """
+
+        return not self._suffixes or path.suffix.lower() in self._suffixes
 
     @abstractmethod
-    def extract(self, path: Path, rel_path: Path) -> Optional[CatalogEntry]:
+    def extract(
+        self, path: Path, rel_path: Path, context: Optional[ScanContext] = None
+    ) -> Optional[CatalogEntry]:
         """Extract a :class:`CatalogEntry` from ``path`` if possible."""
+
+    @staticmethod
+    def _stat(path: Path, context: Optional[ScanContext] = None) -> os.stat_result:
+        """Return the cached stat result from ``context``, falling back to ``path.stat()``."""
+
+        if context is not None:
+            return context.stat_result
+        return path.stat()
+
+    @staticmethod
+    def _suffix(path: Path, context: Optional[ScanContext] = None) -> str:
+        """Return the lower-case suffix from ``context``, falling back to ``path.suffix``."""
+
+        if context is not None and context.suffix is not None:
+            return context.suffix
+        return path.suffix.lower()
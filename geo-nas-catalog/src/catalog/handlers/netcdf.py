@@ -1,45 +1,67 @@
 """Handler for NetCDF datasets."""
 from __future__ import annotations
 
+import math
+import os
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Tuple, Union
 
-import xarray as xr
+import netCDF4
+import numpy as np
 
 from ..metadata import CatalogEntry
-from .base import FileHandler
+from .base import FileHandler, ScanContext
+
+# netCDF4/HDF5 are not thread-safe; the scanner runs handlers on a thread pool.
+_NETCDF_LOCK = threading.Lock()
+_HEADER_PREFETCH_BYTES = 1 << 20
 
 
 class NetCDFHandler(FileHandler):
-    """Extract metadata for NetCDF files using :mod:`xarray`."""
+    """Extract metadata for NetCDF files by reading headers with :mod:`netCDF4`.
+
+    Only variable names, attributes and the two ends of the time axis are read;
+    no CF decoding is applied and no data arrays are loaded.
+    """
 
     formats = (".nc", ".cdf", ".netcdf")
 
-    def sniff(self, path: Path) -> bool:
-        return path.suffix.lower() in self.formats
+    def extract(
+        self, path: Path, rel_path: Path, context: Optional[ScanContext] = None
+    ) -> Optional[CatalogEntry]:
+        stat = self._stat(path, context)
+        _prefetch_header(path)
+        with _NETCDF_LOCK:
+            return self._extract_locked(path, rel_path, stat)
 
-    def extract(self, path: Path, rel_path: Path) -> Optional[CatalogEntry]:
-        stat = path.stat()
+    def _extract_locked(
+        self, path: Path, rel_path: Path, stat: os.stat_result
+    ) -> Optional[CatalogEntry]:
         try:
-            ds = xr.open_dataset(path, engine="netcdf4")
+            nc = netCDF4.Dataset(path, "r")
         except Exception:  # pragma: no cover - logged by caller
             return None
-        variables = [var for var in ds.data_vars]
-        units = {
-            name: str(ds[name].attrs.get("units", ""))
-            for name in ds.data_vars
-            if "units" in ds[name].attrs
-        }
-        temporal_resolution = ds.attrs.get("time_resolution")
-        coverage = None
-        if "time" in ds.coords:
-            times = ds.indexes["time"]
-            if len(times) >= 1:
-                start = times[0].item()
-                end = times[-1].item()
-                coverage = (str(start), str(end))
-        ds.close()
+        try:
+            coordinates = set(nc.dimensions)
+            for var in nc.variables.values():
+                coordinates.update(str(getattr(var, "coordinates", "")).split())
+            variables = [name for name in nc.variables if name not in coordinates]
+            units = {
+                name: str(nc.variables[name].getncattr("units"))
+                for name in variables
+                if "units" in nc.variables[name].ncattrs()
+            }
+            global_attrs = nc.ncattrs()
+            temporal_resolution = (
+                str(nc.getncattr("time_resolution")) if "time_resolution" in global_attrs else None
+            )
+            extent = _geospatial_extent(nc, global_attrs)
+            coverage = _time_coverage(nc.variables.get("time"))
+            data_type = "grid" if nc.dimensions else None
+        finally:
+            nc.close()
         return CatalogEntry(
             path=path,
             rel_path=rel_path,
@@ -50,5 +72,75 @@ class NetCDFHandler(FileHandler):
             units=units,
             temporal_resolution=temporal_resolution,
             time_coverage=coverage,
-            data_type="grid" if ds.dims else None,
+            extent=extent,
+            data_type=data_type,
         )
+
+
+def _prefetch_header(path: Path) -> None:
+    """Ask the kernel to start reading the file header before the HDF5 lock is taken.
+
+    Concurrent prefetches overlap the network round-trips of several files while
+    the lock-protected parsing itself stays serial.
+    """
+
+    if not hasattr(os, "posix_fadvise"):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, _HEADER_PREFETCH_BYTES, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _geospatial_extent(
+    nc: netCDF4.Dataset, global_attrs: List[str]
+) -> Optional[Dict[str, Union[str, float]]]:
+    """Collect scalar ACDD ``geospatial_*`` global attributes, if any."""
+
+    extent: Dict[str, Union[str, float]] = {}
+    for key in global_attrs:
+        if not key.startswith("geospatial_"):
+            continue
+        value = nc.getncattr(key)
+        if isinstance(value, str):
+            extent[key[len("geospatial_"):]] = value
+        elif np.ndim(value) == 0:
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                continue
+            if math.isfinite(number):
+                extent[key[len("geospatial_"):]] = number
+    return extent or None
+
+
+def _time_coverage(time: Optional[netCDF4.Variable]) -> Optional[Tuple[str, str]]:
+    """Decode only the first and last values of a 1-D time variable.
+
+    When an end is a ``_FillValue`` the first and last unmasked steps are used
+    instead, which requires reading the whole axis.
+    """
+
+    if time is None or time.ndim != 1 or time.shape[0] == 0:
+        return None
+    ends = time[[0, -1]]
+    if np.ma.is_masked(ends):
+        valid = np.ma.compressed(time[:])
+        if valid.size == 0:
+            return None
+        ends = valid[[0, -1]]
+    ends = np.ma.getdata(ends)
+    if "units" not in time.ncattrs():
+        return (str(ends[0]), str(ends[-1]))
+    calendar = time.getncattr("calendar") if "calendar" in time.ncattrs() else "standard"
+    try:
+        start, end = netCDF4.num2date(ends, time.getncattr("units"), calendar=calendar)
+    except (ValueError, TypeError, OverflowError):
+        return (str(ends[0]), str(ends[-1]))
+    return (str(start), str(end))
@@ -6,7 +6,7 @@ from pathlib import Path
 from typing import Optional
 
 from ..metadata import CatalogEntry
-from .base import FileHandler
+from .base import FileHandler, ScanContext
 
 
 class GenericHandler(FileHandler):
@@ -14,11 +14,10 @@ class GenericHandler(FileHandler):
 
     formats = ()
 
-    def sniff(self, path: Path) -> bool:
-        return True
-
-    def extract(self, path: Path, rel_path: Path) -> Optional[CatalogEntry]:
-        stat = path.stat()
+    def extract(
+        self, path: Path, rel_path: Path, context: Optional[ScanContext] = None
+    ) -> Optional[CatalogEntry]:
+        stat = self._stat(path, context)
         return CatalogEntry(
             path=path,
             rel_path=rel_path,
@@ -1,49 +1,86 @@
 """Handlers for text-based tabular datasets (CSV, TXT, Excel)."""
 from __future__ import annotations
 
+import csv
+import io
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
-
-import pandas as pd
+from typing import List, Optional
 
 from ..metadata import CatalogEntry
-from .base import FileHandler
+from .base import FileHandler, ScanContext
+
+_SNIFF_CHARS = 64 * 1024
+_SNIFF_DELIMITERS = ",;\t|"
+_TEXT_FORMATS = {".csv": "csv", ".txt": "txt"}
+
+
+def _csv_header(sample: str) -> List[str]:
+    """Return the first non-empty row of ``sample`` using a sniffed dialect."""
+
+    try:
+        dialect: type[csv.Dialect] | csv.Dialect = csv.Sniffer().sniff(
+            sample, delimiters=_SNIFF_DELIMITERS
+        )
+    except csv.Error:
+        dialect = csv.excel
+    for row in csv.reader(io.StringIO(sample), dialect):
+        if any(cell.strip() for cell in row):
+            return [cell.strip() for cell in row]
+    return []
+
+
+def _excel_header(path: Path, suffix: str) -> List[str]:
+    """Return the first row of the first worksheet without loading the workbook."""
+
+    if suffix == ".xls":
+        import pandas as pd  # openpyxl cannot read legacy .xls workbooks
+
+        return [str(column) for column in pd.read_excel(path, nrows=0).columns]
+    import openpyxl
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        first_row = next(workbook.worksheets[0].iter_rows(max_row=1, values_only=True), ())
+    finally:
+        workbook.close()
+    return [str(value) for value in first_row if value is not None]
 
 
 class CSVHandler(FileHandler):
     formats = (".csv", ".txt")
 
-    def sniff(self, path: Path) -> bool:
-        return path.suffix.lower() in self.formats
-
-    def extract(self, path: Path, rel_path: Path) -> Optional[CatalogEntry]:
-        stat = path.stat()
+    def extract(
+        self, path: Path, rel_path: Path, context: Optional[ScanContext] = None
+    ) -> Optional[CatalogEntry]:
+        stat = self._stat(path, context)
         try:
-            df = pd.read_csv(path, nrows=5)
-        except Exception:  # pragma: no cover
+            with path.open("r", encoding="utf-8", errors="replace", newline="") as handle:
+                sample = handle.read(_SNIFF_CHARS)
+        except OSError:  # pragma: no cover
             return None
+        variables = _csv_header(sample)
         return CatalogEntry(
             path=path,
             rel_path=rel_path,
-            format="csv" if path.suffix.lower() == ".csv" else "txt",
+            format=_TEXT_FORMATS.get(self._suffix(path, context), "txt"),
             size_bytes=stat.st_size,
             modified_utc=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
-            variables=list(df.columns),
+            variables=variables,
             data_type="table",
+            curation_notes=None if variables else "No header row detected",
         )
 
 
 class ExcelHandler(FileHandler):
     formats = (".xls", ".xlsx")
 
-    def sniff(self, path: Path) -> bool:
-        return path.suffix.lower() in self.formats
-
-    def extract(self, path: Path, rel_path: Path) -> Optional[CatalogEntry]:
-        stat = path.stat()
+    def extract(
+        self, path: Path, rel_path: Path, context: Optional[ScanContext] = None
+    ) -> Optional[CatalogEntry]:
+        stat = self._stat(path, context)
         try:
-            df = pd.read_excel(path, nrows=5)
+            variables = _excel_header(path, self._suffix(path, context))
         except Exception:  # pragma: no cover
             return None
         return CatalogEntry(
@@ -52,6 +89,6 @@ class ExcelHandler(FileHandler):
             format="xlsx",
             size_bytes=stat.st_size,
             modified_utc=datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
-            variables=list(df.columns),
+            variables=variables,
             data_type="table",
         )
@@ -1,19 +1,35 @@
 """Pydantic models describing catalog schema and summarisation helpers."""
 from __future__ import annotations
 
+from collections import Counter
 from datetime import datetime
-from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Union
+from pathlib import Path, PurePath
+from typing import TYPE_CHECKING, Dict, Iterable, List, Literal, Optional, Sequence, Tuple, Union
 
-from pydantic import BaseModel, Field, validator
+import orjson
+from pydantic import BaseModel, ConfigDict, Field
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+CatalogFormat = Literal["netcdf", "csv", "txt", "xlsx", "other"]
+
+
+def _encode_default(value: object) -> str:
+    if isinstance(value, PurePath):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
 
 
 class CatalogEntry(BaseModel):
     """Structured representation of a single dataset discovered on disk."""
 
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     path: Path
     rel_path: Path
-    format: str
+    format: CatalogFormat
     size_bytes: int = Field(ge=0)
     modified_utc: datetime
     checksum_sha1: Optional[str] = None
@@ -40,12 +56,16 @@ class CatalogEntry(BaseModel):
     quality_flags: Optional[List[str]] = None
     missing_value: Optional[Union[float, int, str]] = None
 
-    @validator("format")
-    def validate_format(cls, value: str) -> str:
-        allowed = {"netcdf", "csv", "txt", "xlsx", "other"}
-        if value not in allowed:
-            raise ValueError(f"format must be one of {sorted(allowed)}; got {value!r}")
-        return value
+    def to_jsonl(self) -> bytes:
+        """Encode the entry as a newline-terminated JSON line.
+
+        Field values are handed to orjson directly instead of going through
+        :meth:`model_dump`; only ``Path`` values need the Python-level fallback.
+        """
+
+        return orjson.dumps(
+            self.__dict__, default=_encode_default, option=orjson.OPT_APPEND_NEWLINE
+        )
 
 
 class CatalogSummary(BaseModel):
@@ -56,9 +76,34 @@ class CatalogSummary(BaseModel):
     formats: Dict[str, int]
 
     @classmethod
-    def from_entries(cls, entries: List[CatalogEntry]) -> "CatalogSummary":
-        total_size = sum(entry.size_bytes for entry in entries)
-        counts: Dict[str, int] = {}
+    def from_entries(cls, entries: Iterable[CatalogEntry]) -> "CatalogSummary":
+        counts: Counter[str] = Counter()
+        total_size = 0
         for entry in entries:
-            counts[entry.format] = counts.get(entry.format, 0) + 1
-        return cls(total_entries=len(entries), total_size_bytes=total_size, formats=counts)
+            counts[entry.format] += 1
+            total_size += entry.size_bytes
+        return cls(
+            total_entries=counts.total(), total_size_bytes=total_size, formats=dict(counts)
+        )
+
+    @classmethod
+    def from_arrays(
+        cls, sizes: "np.ndarray", format_codes: "np.ndarray", format_names: Sequence[str]
+    ) -> "CatalogSummary":
+        """Build a summary from columnar sizes and integer codes indexing ``format_names``."""
+
+        import numpy as np
+
+        from ._aggregate import aggregate_sizes_and_formats
+
+        total, counts = aggregate_sizes_and_formats(
+            np.ascontiguousarray(sizes, dtype=np.int64),
+            np.ascontiguousarray(format_codes, dtype=np.int64),
+            len(format_names),
+        )
+        formats = {
+            name: int(count)
+            for name, count in zip(format_names, counts, strict=True)
+            if count
+        }
+        return cls(total_entries=len(sizes), total_size_bytes=int(total), formats=formats)
@@ -0,0 +1,146 @@
+"""Streaming Parquet export of catalog records using :mod:`pyarrow`."""
+from __future__ import annotations
+
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List
+
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+if TYPE_CHECKING:
+    from .metadata import CatalogEntry
+
+_STRING_LIST = pa.list_(pa.string())
+
+CATALOG_SCHEMA = pa.schema(
+    [
+        ("path", pa.string()),
+        ("rel_path", pa.string()),
+        ("format", pa.string()),
+        ("size_bytes", pa.int64()),
+        ("modified_utc", pa.timestamp("us", tz="UTC")),
+        ("checksum_sha1", pa.string()),
+        ("producer", pa.string()),
+        ("producer_inferred_from", pa.string()),
+        ("method_principle", pa.string()),
+        ("variables", _STRING_LIST),
+        ("units", pa.map_(pa.string(), pa.string())),
+        ("temporal_resolution", pa.string()),
+        ("time_coverage", _STRING_LIST),
+        ("spatial_resolution", pa.string()),
+        ("spatial_ref", pa.string()),
+        ("extent", pa.string()),
+        ("data_type", pa.string()),
+        ("license", pa.string()),
+        ("citation", pa.string()),
+        ("doi", pa.string()),
+        ("readme_path", pa.string()),
+        ("readme_summary", pa.string()),
+        ("application_scope", pa.string()),
+        ("curation_notes", pa.string()),
+        ("read_example_path", pa.string()),
+        ("plot_example_path", pa.string()),
+        ("quality_flags", _STRING_LIST),
+        ("missing_value", pa.string()),
+    ]
+)
+"""Arrow schema of the Parquet catalog.
+
+``extent`` is stored as JSON text and ``missing_value`` as text because both hold
+mixed-type values in :class:`~catalog.metadata.CatalogEntry`.
+"""
+
+# JSONL records carry ISO-8601 strings for timestamps; they are parsed by a
+# vectorised cast after the batch is built.
+_RECORD_SCHEMA = CATALOG_SCHEMA.set(
+    CATALOG_SCHEMA.get_field_index("modified_utc"), pa.field("modified_utc", pa.string())
+)
+
+BATCH_ROWS = 10_000
+
+COLUMN_NAMES: List[str] = CATALOG_SCHEMA.names
+COLUMN_TYPES: Dict[str, pa.DataType] = {field.name: field.type for field in CATALOG_SCHEMA}
+
+
+def _optional(convert: Callable[[Any], Any]) -> Callable[[List[Any]], List[Any]]:
+    return lambda values: [None if value is None else convert(value) for value in values]
+
+
+# Columns whose CatalogEntry values have no direct Arrow equivalent.
+_COLUMN_CONVERTERS: Dict[str, Callable[[List[Any]], List[Any]]] = {
+    "path": _optional(str),
+    "rel_path": _optional(str),
+    "readme_path": _optional(str),
+    "read_example_path": _optional(str),
+    "plot_example_path": _optional(str),
+    "extent": _optional(lambda extent: orjson.dumps(extent).decode()),
+    "missing_value": _optional(str),
+}
+
+
+def _coerce(record: Dict[str, Any]) -> Dict[str, Any]:
+    extent = record.get("extent")
+    missing_value = record.get("missing_value")
+    if extent is None and missing_value is None:
+        return record
+    record = dict(record)
+    if extent is not None:
+        record["extent"] = orjson.dumps(extent).decode()
+    if missing_value is not None:
+        record["missing_value"] = str(missing_value)
+    return record
+
+
+def records_to_table(records: List[Dict[str, Any]]) -> pa.Table:
+    """Convert JSON-compatible catalog records into a table matching :data:`CATALOG_SCHEMA`."""
+
+    table = pa.Table.from_pylist([_coerce(record) for record in records], schema=_RECORD_SCHEMA)
+    return table.cast(CATALOG_SCHEMA)
+
+
+def write_parquet(
+    records: Iterable[Dict[str, Any]], path: Path, batch_rows: int = BATCH_ROWS
+) -> int:
+    """Stream ``records`` into a ZSTD-compressed Parquet file and return the row count."""
+
+    iterator = iter(records)
+    count = 0
+    with pq.ParquetWriter(path, CATALOG_SCHEMA, compression="zstd", use_dictionary=True) as writer:
+        while chunk := list(islice(iterator, batch_rows)):
+            writer.write_table(records_to_table(chunk))
+            count += len(chunk)
+    return count
+
+
+class ColumnBuffer:
+    """Accumulate :class:`~catalog.metadata.CatalogEntry` fields column by column.
+
+    Field values are appended to one list per column of :data:`CATALOG_SCHEMA` and
+    turned into a record batch with one typed :func:`pyarrow.array` per column,
+    skipping the per-row dictionaries and type inference of ``Table.from_pylist``.
+    """
+
+    def __init__(self) -> None:
+        self._columns: Dict[str, List[Any]] = {name: [] for name in COLUMN_NAMES}
+
+    def __len__(self) -> int:
+        return len(self._columns["path"])
+
+    def append(self, entry: "CatalogEntry") -> None:
+        values = entry.__dict__
+        for name, column in self._columns.items():
+            column.append(values[name])
+
+    def to_batch(self) -> pa.RecordBatch:
+        arrays = []
+        for name in COLUMN_NAMES:
+            values = self._columns[name]
+            convert = _COLUMN_CONVERTERS.get(name)
+            arrays.append(pa.array(convert(values) if convert else values, type=COLUMN_TYPES[name]))
+        return pa.RecordBatch.from_arrays(arrays, schema=CATALOG_SCHEMA)
+
+    def clear(self) -> None:
+        for column in self._columns.values():
+            column.clear()
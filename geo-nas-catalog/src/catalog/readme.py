@@ -1,6 +1,8 @@
 """Utilities for discovering and summarising README files alongside datasets."""
 from __future__ import annotations
 
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable, Optional
 
@@ -8,22 +10,58 @@ from rich.console import Console
 
 console = Console()
 
+README_NAMES = ("README.md", "readme.txt", "README.txt")
+_LEADING_SLACK_BYTES = 512
+
+
+@lru_cache(maxsize=4096)
+def _readme_in_directory(directory: Path) -> Optional[Path]:
+    for name in README_NAMES:
+        path = directory / name
+        if path.exists():
+            return path
+    return None
+
+
+@lru_cache(maxsize=1024)
+def _cached_summary(path: Path) -> str:
+    return summarise_readme(path)
+
+
+def clear_readme_cache() -> None:
+    """Forget README lookups and summaries remembered by :func:`attach_readme`."""
+
+    _readme_in_directory.cache_clear()
+    _cached_summary.cache_clear()
+
 
 def find_readme(start: Path) -> Optional[Path]:
-    """Return the closest README-like file relative to ``start``."""
+    """Return the closest README-like file relative to ``start``.
+
+    Lookups are memoised per directory, so files sharing a parent only probe the
+    filesystem once; call :func:`clear_readme_cache` after the tree changes.
+    """
 
     for candidate in start.parents:
-        for name in ("README.md", "readme.txt", "README.txt"):
-            path = candidate / name
-            if path.exists():
-                return path
+        path = _readme_in_directory(candidate)
+        if path is not None:
+            return path
     return None
 
 
 def summarise_readme(path: Path, max_chars: int = 500) -> str:
-    """Return a truncated snippet of a README for quick inspection."""
+    """Return a truncated snippet of a README for quick inspection.
 
-    text = path.read_text(encoding="utf-8", errors="ignore")
+    Only the first ``4 * max_chars`` bytes (the UTF-8 worst case) plus some slack
+    for leading whitespace are read, with a single unbuffered ``os.read``.
+    """
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        raw = os.read(fd, 4 * max_chars + _LEADING_SLACK_BYTES)
+    finally:
+        os.close(fd)
+    text = raw.decode("utf-8", errors="ignore")
     snippet = text.strip().replace("\n", " ")[:max_chars]
     if len(text) > max_chars:
         snippet += "…"
@@ -32,11 +70,17 @@ def summarise_readme(path: Path, max_chars: int = 500) -> str:
 
 
 def attach_readme(entries: Iterable[dict]) -> Iterable[dict]:
-    """Attach README summaries to catalog entries."""
-
-    for entry in entries:
-        readme_path = find_readme(Path(entry["path"]))
-        if readme_path:
-            entry["readme_path"] = str(readme_path)
-            entry["readme_summary"] = summarise_readme(readme_path)
-        yield entry
+    """Attach README summaries to catalog entries.
+
+    Each README is read and summarised once however many entries share it.
+    """
+
+    try:
+        for entry in entries:
+            readme_path = find_readme(Path(entry["path"]))
+            if readme_path:
+                entry["readme_path"] = str(readme_path)
+                entry["readme_summary"] = _cached_summary(readme_path)
+            yield entry
+    finally:
+        clear_readme_cache()
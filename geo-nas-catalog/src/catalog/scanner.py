@@ -1,18 +1,35 @@
 """Filesystem scanning utilities for building the dataset catalog."""
 from __future__ import annotations
 
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 import os
 from pathlib import Path
-from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+import queue
+import sys
+import threading
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Tuple
 
-from rich.progress import Progress
+from rich.progress import Progress, TaskID
+from utils.hashing import file_sha1
 
-from .handlers.base import FileHandler
+from .handlers.base import FileHandler, ScanContext
 from .handlers.netcdf import NetCDFHandler
 from .handlers.other import GenericHandler
 from .handlers.tabular import CSVHandler, ExcelHandler
 from .metadata import CatalogEntry
+from .schema import ScanState
+
+_DONE = object()
+_POLL_SECONDS = 0.1
+_PENDING_PER_WORKER = 64
+_PROGRESS_EVERY = 256
+_DESCRIBE_EVERY_DIRS = 64
+# Recorded mtimes come from CatalogEntry.modified_utc, which keeps microseconds only.
+_MTIME_TOLERANCE = 1e-6
+
+SCAN_BATCH_SIZE = 1024
 
 
 @dataclass(slots=True)
@@ -24,6 +41,262 @@ class ScanConfig:
     exclude_dirs: Sequence[str] = (".git", "__pycache__")
     follow_symlinks: bool = False
     handler_overrides: Optional[Iterable[FileHandler]] = None
+    workers: int = 8
+    compute_checksums: bool = False
+    state: Optional[ScanState] = None
+
+
+def _suffix(name: str) -> str:
+    """Return the lower-case suffix of ``name`` like :attr:`Path.suffix` without a ``Path``."""
+
+    dot = name.rfind(".")
+    return name[dot:].lower() if dot > 0 else ""
+
+
+class _ProgressReporter:
+    """Serialise and coalesce progress updates coming from worker threads."""
+
+    def __init__(self, progress: Progress, task: TaskID, every: int = _PROGRESS_EVERY) -> None:
+        self._progress = progress
+        self._task = task
+        self._every = every
+        self._pending = 0
+        self._directories = 0
+        self._lock = threading.Lock()
+
+    def directory(self, dirpath: str) -> None:
+        with self._lock:
+            if self._directories % _DESCRIBE_EVERY_DIRS == 0:
+                self._progress.update(self._task, description=f"Scanning {dirpath}")
+            self._directories += 1
+
+    def advance(self) -> None:
+        with self._lock:
+            self._pending += 1
+            if self._pending >= self._every:
+                self._progress.update(self._task, advance=self._pending)
+                self._pending = 0
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._pending:
+                self._progress.update(self._task, advance=self._pending)
+                self._pending = 0
+
+
+@dataclass(frozen=True, slots=True)
+class _HandlerDispatch:
+    """Lower-case suffix to handler lookup table, built once per handler list.
+
+    Only suffixes missing from the table are offered to handlers that override
+    :meth:`FileHandler.sniff`, before falling back to the catch-all handler.
+    """
+
+    by_suffix: Dict[str, FileHandler]
+    sniffers: Tuple[FileHandler, ...]
+    fallback: FileHandler
+
+    @classmethod
+    def build(cls, handlers: Sequence[FileHandler]) -> "_HandlerDispatch":
+        by_suffix: Dict[str, FileHandler] = {}
+        fallback: Optional[FileHandler] = None
+        for handler in handlers:
+            if not handler._suffixes and fallback is None:
+                fallback = handler
+            for suffix in handler._suffixes:
+                by_suffix.setdefault(suffix, handler)
+        sniffers = tuple(
+            handler for handler in handlers if type(handler).sniff is not FileHandler.sniff
+        )
+        return cls(by_suffix=by_suffix, sniffers=sniffers, fallback=fallback or handlers[-1])
+
+    def select(self, suffix: str, path: "str | os.PathLike[str]") -> FileHandler:
+        handler = self.by_suffix.get(suffix)
+        if handler is not None:
+            return handler
+        if self.sniffers:
+            candidate = Path(path)
+            for sniffer in self.sniffers:
+                if sniffer.sniff(candidate):
+                    return sniffer
+        return self.fallback
+
+
+class _ScanRun:
+    """Walker/extractor thread pools and queues backing a single :meth:`CatalogScanner.scan`.
+
+    Walker threads pop directories from ``directories``, list them with
+    :func:`os.scandir`, push subdirectories back onto the queue and submit files to
+    the extractor pool. Extracted entries (or the first exception raised) are
+    handed to the consuming generator through the bounded ``results`` queue.
+    """
+
+    def __init__(
+        self,
+        config: ScanConfig,
+        dispatch: _HandlerDispatch,
+        include_suffixes: Optional[FrozenSet[str]],
+        exclude_dirs: FrozenSet[str],
+        reporter: _ProgressReporter,
+    ) -> None:
+        self.dispatch = dispatch
+        self.root = config.root
+        self.root_prefix = os.path.join(str(config.root), "")
+        self.follow_symlinks = config.follow_symlinks
+        self.compute_checksums = config.compute_checksums
+        self.state = config.state
+        self.include_suffixes = include_suffixes
+        self.exclude_dirs = exclude_dirs
+        self.reporter = reporter
+        self.workers = max(1, config.workers)
+        self.directories: "queue.Queue[Optional[str]]" = queue.Queue()
+        self.results: "queue.Queue[object]" = queue.Queue(
+            maxsize=self.workers * _PENDING_PER_WORKER
+        )
+        self.slots = threading.BoundedSemaphore(self.workers * _PENDING_PER_WORKER)
+        self.stop = threading.Event()
+        self.walkers = ThreadPoolExecutor(self.workers, thread_name_prefix="catalog-walk")
+        self.extractors = ThreadPoolExecutor(self.workers, thread_name_prefix="catalog-extract")
+        # NetCDF extraction is serialised on the HDF5 lock; a separate pool keeps those
+        # files from occupying every extractor thread while tabular work waits behind them.
+        self.netcdf_extractors = ThreadPoolExecutor(
+            self.workers, thread_name_prefix="catalog-netcdf"
+        )
+        self.coordinator = threading.Thread(
+            target=self._coordinate, name="catalog-scan", daemon=True
+        )
+
+    def start(self) -> None:
+        self.directories.put(str(self.root))
+        for _ in range(self.workers):
+            self.walkers.submit(self._walk)
+        self.coordinator.start()
+
+    def close(self) -> None:
+        self.stop.set()
+        self.coordinator.join()
+
+    def batches(self, batch_size: int) -> Iterator[List[CatalogEntry]]:
+        """Yield lists of up to ``batch_size`` entries as they become available.
+
+        After blocking for the first item of a batch, the rest is drained from
+        ``results`` without waiting, so a batch never delays entries already produced.
+        """
+
+        batch: List[CatalogEntry] = []
+        while True:
+            item = self.results.get()
+            while True:
+                if item is _DONE:
+                    if batch:
+                        yield batch
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                entry: CatalogEntry = item  # type: ignore[assignment]
+                batch.append(entry)
+                if self.state is not None:
+                    self.state.update(entry.path, entry.modified_utc.timestamp())
+                if len(batch) >= batch_size:
+                    break
+                try:
+                    item = self.results.get_nowait()
+                except queue.Empty:
+                    break
+            yield batch
+            batch = []
+
+    def _emit(self, item: object) -> None:
+        while not self.stop.is_set():
+            try:
+                self.results.put(item, timeout=_POLL_SECONDS)
+                return
+            except queue.Full:
+                continue
+
+    def _coordinate(self) -> None:
+        self.directories.join()
+        for _ in range(self.workers):
+            self.directories.put(None)
+        self.walkers.shutdown(wait=True)
+        self.extractors.shutdown(wait=True)
+        self.netcdf_extractors.shutdown(wait=True)
+        self._emit(_DONE)
+
+    def _walk(self) -> None:
+        while True:
+            dirpath = self.directories.get()
+            try:
+                if dirpath is None:
+                    return
+                if not self.stop.is_set():
+                    self._scan_directory(dirpath)
+            except BaseException as exc:  # noqa: BLE001 - re-raised by the consumer
+                self._emit(exc)
+            finally:
+                self.directories.task_done()
+
+    def _scan_directory(self, dirpath: str) -> None:
+        try:
+            iterator = os.scandir(dirpath)
+        except OSError:
+            return
+        self.reporter.directory(dirpath)
+        with iterator:
+            for entry in iterator:
+                if entry.is_dir(follow_symlinks=self.follow_symlinks):
+                    if entry.name.lower() not in self.exclude_dirs:
+                        self.directories.put(entry.path)
+                    continue
+                if not entry.is_file(follow_symlinks=self.follow_symlinks):
+                    continue
+                suffix = _suffix(entry.name)
+                if self.include_suffixes is not None and suffix not in self.include_suffixes:
+                    continue
+                handler = self.dispatch.select(suffix, entry.path)
+                pool = (
+                    self.netcdf_extractors
+                    if isinstance(handler, NetCDFHandler)
+                    else self.extractors
+                )
+                if not self._acquire_slot():
+                    return
+                pool.submit(self._extract, handler, entry, suffix)
+
+    def _acquire_slot(self) -> bool:
+        while not self.stop.is_set():
+            if self.slots.acquire(timeout=_POLL_SECONDS):
+                return True
+        return False
+
+    def _extract(self, handler: FileHandler, dir_entry: os.DirEntry[str], suffix: str) -> None:
+        # stat() runs here rather than in the walker so the stats of one directory
+        # are issued concurrently across the extractor pool instead of serially.
+        try:
+            if self.stop.is_set():
+                return
+            full = dir_entry.path
+            try:
+                context = ScanContext(stat_result=dir_entry.stat(), suffix=suffix)
+            except OSError:
+                return
+            if self.state is not None:
+                stored = self.state.known(full)
+                if stored is not None and stored >= context.stat_result.st_mtime - _MTIME_TOLERANCE:
+                    self.reporter.advance()
+                    return
+            # Paths stay plain strings up to here; Path objects are only built for handlers.
+            path = Path(full)
+            entry = handler.extract(path, Path(full[len(self.root_prefix):]), context)
+            if entry is not None:
+                if self.compute_checksums:
+                    entry = entry.model_copy(update={"checksum_sha1": file_sha1(path)})
+                self._emit(entry)
+            self.reporter.advance()
+        except BaseException as exc:  # noqa: BLE001 - re-raised by the consumer
+            self._emit(exc)
+        finally:
+            self.slots.release()
 
 
 @dataclass
@@ -31,46 +304,72 @@ class CatalogScanner:
     """Scan directories and dispatch to registered file handlers."""
 
     handlers: List[FileHandler] = field(default_factory=list)
+    _dispatch: _HandlerDispatch = field(init=False, repr=False)
 
     def __post_init__(self) -> None:
         if not self.handlers:
             self.handlers = [NetCDFHandler(), CSVHandler(), ExcelHandler(), GenericHandler()]
+        self._dispatch = _HandlerDispatch.build(self.handlers)
 
-    def _select_handler(self, path: Path, handlers: Sequence[FileHandler]) -> FileHandler:
-        for handler in handlers:
-            if handler.sniff(path):
-                return handler
-        return handlers[-1]
+    def _select_handler(self, path: Path) -> FileHandler:
+        return self._dispatch.select(path.suffix.lower(), path)
 
     def scan(self, config: ScanConfig) -> Iterator[CatalogEntry]:
+        """Yield catalog entries for every file below ``config.root``.
+
+        Directory listing and per-file work (stat, handler extraction and, with
+        ``config.compute_checksums``, SHA1 hashing) run on ``config.workers`` threads
+        each, so entries are yielded in completion order rather than walk order.
+
+        With ``config.state``, files whose mtime is not newer than the recorded one
+        are skipped before any handler runs, and every yielded entry is recorded.
+        """
+
+        batches = self.scan_batched(config)
+        try:
+            for batch in batches:
+                yield from batch
+        finally:
+            batches.close()
+
+    def scan_batched(
+        self, config: ScanConfig, batch_size: int = SCAN_BATCH_SIZE
+    ) -> Iterator[List[CatalogEntry]]:
+        """Like :meth:`scan`, but yield lists of up to ``batch_size`` entries."""
+
         root = config.root
         if not root.exists():
             raise FileNotFoundError(f"Scan root {root} does not exist")
         include_suffixes = (
-            tuple(s.lower() for s in config.include_suffixes)
+            frozenset(s.lower() for s in config.include_suffixes)
             if config.include_suffixes
             else None
         )
-        exclude_dirs = {name.lower() for name in config.exclude_dirs}
-        handlers: Sequence[FileHandler] = list(config.handler_overrides or self.handlers)
-        with Progress() as progress:
+        exclude_dirs = frozenset(name.lower() for name in config.exclude_dirs)
+        dispatch = (
+            _HandlerDispatch.build(list(config.handler_overrides))
+            if config.handler_overrides
+            else self._dispatch
+        )
+        with Progress(disable=not sys.stdout.isatty()) as progress:
             task = progress.add_task("Scanning", start=False)
             progress.start_task(task)
-            for dirpath, dirnames, filenames in os.walk(root, followlinks=config.follow_symlinks):
-                dirnames[:] = [d for d in dirnames if d.lower() not in exclude_dirs]
-                progress.update(task, advance=0, description=f"Scanning {dirpath}")
-                for filename in filenames:
-                    path = Path(dirpath) / filename
-                    if include_suffixes and path.suffix.lower() not in include_suffixes:
-                        continue
-                    handler = self._select_handler(path, handlers)
-                    rel_path = path.relative_to(root)
-                    entry = handler.extract(path, rel_path)
-                    if entry is not None:
-                        yield entry
+            reporter = _ProgressReporter(progress, task)
+            run = _ScanRun(config, dispatch, include_suffixes, exclude_dirs, reporter)
+            run.start()
+            try:
+                yield from run.batches(max(1, batch_size))
+            finally:
+                run.close()
+                reporter.flush()
 
     def summarize(self, entries: Iterable[CatalogEntry]) -> Dict[str, int]:
-        counts: Dict[str, int] = {}
-        for entry in entries:
-            counts[entry.format] = counts.get(entry.format, 0) + 1
-        return counts
+        return dict(Counter(entry.format for entry in entries))
+
+    def summarize_scan(self, config: ScanConfig) -> Dict[str, int]:
+        """Scan ``config.root`` and count entries per format without keeping them."""
+
+        counts: Counter[str] = Counter()
+        for batch in self.scan_batched(config):
+            counts.update(entry.format for entry in batch)
+        return dict(counts)
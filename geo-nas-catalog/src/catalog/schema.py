@@ -1,17 +1,28 @@
 """Pydantic models and helpers describing the on-disk catalog schema."""
 from __future__ import annotations
 
+from array import array
+from collections import Counter
 from datetime import datetime, timezone
-import json
+import hashlib
+import os
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 from typing import Literal
 
-from pydantic import BaseModel, Field, validator
+import orjson
+from pydantic import BaseModel, Field
 
 
 CatalogFormat = Literal["netcdf", "csv", "txt", "xlsx", "other"]
 
+_UTC = timezone.utc
+_STATE_MAGIC = b"GEOSCANSTATE1\n"
+
+
+def _optional_fspath(path: Optional[Path]) -> Optional[str]:
+    return None if path is None else path.__fspath__()
+
 
 class CatalogEntry(BaseModel):
     """Structured metadata describing a single discovered dataset."""
@@ -53,20 +64,13 @@ class CatalogEntry(BaseModel):
             datetime: lambda value: value.astimezone(timezone.utc).isoformat(),
         }
 
-    @validator("format")
-    def validate_format(cls, value: str) -> str:
-        allowed = {"netcdf", "csv", "txt", "xlsx", "other"}
-        if value not in allowed:
-            raise ValueError(f"format must be one of {sorted(allowed)}; got {value!r}")
-        return value
-
     def as_record(self) -> Dict[str, Any]:
         """Return a JSON-serialisable mapping representing this entry."""
 
         data = self.model_dump()
         data["path"] = str(self.path)
         data["rel_path"] = str(self.rel_path)
-        data["modified_utc"] = self.modified_utc.astimezone(timezone.utc).isoformat()
+        data["modified_utc"] = self.modified_utc.astimezone(_UTC).isoformat()
         if self.readme_path is not None:
             data["readme_path"] = str(self.readme_path)
         if self.read_example_path is not None:
@@ -84,10 +88,54 @@ class CatalogEntry(BaseModel):
             data["time_coverage_end"] = None
         return data
 
+    def as_record_fast(self) -> Dict[str, Any]:
+        """Return the same mapping as :meth:`as_record` without :meth:`model_dump`.
+
+        The record is built straight from the field values, so list and dict
+        values are shared with the entry rather than copied and must not be mutated.
+        """
+
+        optional_path = _optional_fspath
+        time_coverage = self.time_coverage
+        start, end = time_coverage if time_coverage is not None else (None, None)
+        return {
+            "path": self.path.__fspath__(),
+            "rel_path": self.rel_path.__fspath__(),
+            "format": self.format,
+            "size_bytes": self.size_bytes,
+            "modified_utc": self.modified_utc.astimezone(_UTC).isoformat(),
+            "checksum_sha1": self.checksum_sha1,
+            "producer": self.producer,
+            "producer_inferred_from": self.producer_inferred_from,
+            "method_principle": self.method_principle,
+            "variables": self.variables,
+            "units": self.units,
+            "temporal_resolution": self.temporal_resolution,
+            "time_coverage": None if time_coverage is None else [start, end],
+            "spatial_resolution": self.spatial_resolution,
+            "spatial_ref": self.spatial_ref,
+            "extent": self.extent,
+            "data_type": self.data_type,
+            "license": self.license,
+            "citation": self.citation,
+            "doi": self.doi,
+            "readme_path": optional_path(self.readme_path),
+            "readme_summary": self.readme_summary,
+            "application_scope": self.application_scope,
+            "curation_notes": self.curation_notes,
+            "read_example_path": optional_path(self.read_example_path),
+            "plot_example_path": optional_path(self.plot_example_path),
+            "quality_flags": self.quality_flags,
+            "missing_value": self.missing_value,
+            "error": self.error,
+            "time_coverage_start": start,
+            "time_coverage_end": end,
+        }
+
     def jsonl(self) -> str:
         """Serialise the entry to a JSONL-compatible string."""
 
-        return json.dumps(self.as_record(), ensure_ascii=False)
+        return orjson.dumps(self.as_record_fast()).decode()
 
 
 class CatalogSummary(BaseModel):
@@ -99,24 +147,65 @@ class CatalogSummary(BaseModel):
 
     @classmethod
     def from_entries(cls, entries: Iterable[CatalogEntry]) -> "CatalogSummary":
-        entries_list = list(entries)
-        total_size = sum(entry.size_bytes for entry in entries_list)
-        counts: Dict[str, int] = {}
-        for entry in entries_list:
-            counts[entry.format] = counts.get(entry.format, 0) + 1
-        return cls(total_entries=len(entries_list), total_size_bytes=total_size, formats=counts)
+        counts: Counter[str] = Counter()
+        total_size = 0
+        for entry in entries:
+            counts[entry.format] += 1
+            total_size += entry.size_bytes
+        return cls(
+            total_entries=counts.total(), total_size_bytes=total_size, formats=dict(counts)
+        )
 
 
 class ScanState(BaseModel):
-    """State describing previously processed files for resumable scans."""
+    """State describing previously processed files for resumable scans.
 
-    processed: Dict[str, float] = Field(default_factory=dict)
+    Paths are keyed by a stable 64-bit BLAKE2b digest of their bytes rather than
+    the path string, and the state is saved as two packed arrays.
+    """
+
+    processed: Dict[int, float] = Field(default_factory=dict)
+
+    @staticmethod
+    def key(path: "str | os.PathLike[str]") -> int:
+        digest = hashlib.blake2b(os.fsencode(path), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    def known(self, path: "str | os.PathLike[str]") -> Optional[float]:
+        """Return the stored mtime of ``path``, or ``None`` if it was never processed."""
+
+        return self.processed.get(self.key(path))
 
     def should_skip(self, path: Path, mtime: float) -> bool:
-        stored = self.processed.get(str(path))
+        stored = self.known(path)
         return stored is not None and stored >= mtime
 
-    def update(self, path: Path, mtime: float) -> None:
-        self.processed[str(path)] = mtime
-
+    def update(self, path: "str | os.PathLike[str]", mtime: float) -> None:
+        self.processed[self.key(path)] = mtime
 
+    @classmethod
+    def load(cls, path: Path) -> "ScanState":
+        """Read a state file written by :meth:`save`, or return an empty state.
+
+        Legacy JSON state files keyed by path strings are converted on load.
+        """
+
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return cls()
+        if not data.startswith(_STATE_MAGIC):
+            legacy = orjson.loads(data).get("processed", {})
+            return cls(processed={cls.key(Path(name)): mtime for name, mtime in legacy.items()})
+        keys = array("Q")
+        mtimes = array("d")
+        body = memoryview(data)[len(_STATE_MAGIC):]
+        split = len(body) // 2
+        keys.frombytes(body[:split])
+        mtimes.frombytes(body[split:])
+        return cls.model_construct(processed=dict(zip(keys, mtimes, strict=True)))
+
+    def save(self, path: Path) -> None:
+        keys = array("Q", self.processed.keys())
+        mtimes = array("d", self.processed.values())
+        path.write_bytes(_STATE_MAGIC + keys.tobytes() + mtimes.tobytes())
@@ -0,0 +1,91 @@
+"""Batched JSONL/Parquet sink for catalog entries produced by a scan."""
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, List, Optional
+
+from .metadata import CatalogEntry
+
+if TYPE_CHECKING:
+    import pyarrow.parquet as pq
+
+    from .parquet import ColumnBuffer
+
+BATCH_SIZE = 4096
+_WRITE_BUFFER_BYTES = 1 << 20
+
+
+class CatalogWriter:
+    """Append catalog entries to a JSONL file and, optionally, a Parquet file.
+
+    Entries are buffered and written ``batch_size`` at a time: JSONL lines go out
+    through a single ``writelines`` call and each Parquet batch becomes one row
+    group of a :class:`pyarrow.parquet.ParquetWriter` kept open until :meth:`close`.
+    """
+
+    def __init__(
+        self,
+        jsonl_path: Path,
+        parquet_path: Optional[Path] = None,
+        batch_size: int = BATCH_SIZE,
+    ) -> None:
+        self.jsonl_path = jsonl_path
+        self.parquet_path = parquet_path
+        self.batch_size = max(1, batch_size)
+        self.count = 0
+        self._lines: List[bytes] = []
+        self._columns: Optional[ColumnBuffer] = None
+        jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+        self._jsonl_handle = jsonl_path.open("wb", buffering=_WRITE_BUFFER_BYTES)
+        self._parquet_writer: Optional[pq.ParquetWriter] = None
+        if parquet_path is not None:
+            import pyarrow.parquet as _pq
+
+            from .parquet import CATALOG_SCHEMA
+            from .parquet import ColumnBuffer as _ColumnBuffer
+
+            self._columns = _ColumnBuffer()
+            parquet_path.parent.mkdir(parents=True, exist_ok=True)
+            self._parquet_writer = _pq.ParquetWriter(
+                parquet_path, CATALOG_SCHEMA, compression="zstd", use_dictionary=True
+            )
+
+    def append(self, entry: CatalogEntry) -> None:
+        self._lines.append(entry.to_jsonl())
+        if self._columns is not None:
+            self._columns.append(entry)
+        if len(self._lines) >= self.batch_size:
+            self.flush()
+
+    def extend(self, entries: Iterable[CatalogEntry]) -> None:
+        for entry in entries:
+            self.append(entry)
+
+    def flush(self) -> None:
+        if not self._lines:
+            return
+        self._jsonl_handle.writelines(self._lines)
+        self.count += len(self._lines)
+        self._lines.clear()
+        if self._parquet_writer is not None and self._columns is not None:
+            self._parquet_writer.write_batch(self._columns.to_batch())
+            self._columns.clear()
+
+    def close(self) -> None:
+        """Flush buffered entries, fsync the JSONL file and finalise the Parquet footer."""
+
+        try:
+            self.flush()
+            self._jsonl_handle.flush()
+            os.fsync(self._jsonl_handle.fileno())
+        finally:
+            self._jsonl_handle.close()
+            if self._parquet_writer is not None:
+                self._parquet_writer.close()
+
+    def __enter__(self) -> "CatalogWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
@@ -11,6 +11,28 @@ from ..utils.logging import get_logger
 
 LOGGER = get_logger(__name__)
 
+_CSV_BLOCK_BYTES = 16 << 20
+
+
+def _read_csv(path: Path) -> pd.DataFrame:
+    """Parse a delimited text file with PyArrow's multithreaded reader.
+
+    Falls back to :func:`pandas.read_csv` for inputs PyArrow rejects.
+    """
+
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+
+    try:
+        table = pacsv.read_csv(
+            path,
+            read_options=pacsv.ReadOptions(use_threads=True, block_size=_CSV_BLOCK_BYTES),
+        )
+    except pa.ArrowInvalid:
+        LOGGER.debug("PyArrow could not parse %s, retrying with pandas", path)
+        return pd.read_csv(path)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
 
 def load_dataset(path: Path) -> Any:
     """Load a dataset using a sensible engine inferred from the file suffix."""
@@ -21,7 +43,7 @@ def load_dataset(path: Path) -> Any:
         return xr.open_dataset(path, engine="netcdf4")
     if suffix in {".csv", ".txt"}:
         LOGGER.info("Reading tabular dataset at %s", path)
-        return pd.read_csv(path)
+        return _read_csv(path)
     if suffix in {".xls", ".xlsx"}:
         LOGGER.info("Reading Excel dataset at %s", path)
         return pd.read_excel(path)
@@ -1,8 +1,9 @@
 """Utilities for exporting figures to multiple formats with consistent settings."""
 from __future__ import annotations
 
+import io
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Optional
 
 import matplotlib.pyplot as plt
 
@@ -10,12 +11,52 @@ from ..utils.logging import get_logger
 
 LOGGER = get_logger(__name__)
 
+_EXPORT_DPI = 600
+_RASTER_FORMATS = frozenset({"png", "jpg", "jpeg", "tif", "tiff", "webp"})
+_OPAQUE_FORMATS = frozenset({"jpg", "jpeg"})
+
 
 def export_figure(path: Path, formats: Iterable[str] = ("png", "eps")) -> None:
-    """Export the current Matplotlib figure to the given formats at 600 dpi."""
+    """Export the current Matplotlib figure to the given formats at 600 dpi.
+
+    The tight bounding box is measured once and reused for every format instead
+    of letting each ``savefig(bbox_inches="tight")`` lay the figure out again.
+    Raster formats share a single Agg rendering: the figure is rasterised to PNG
+    once and Pillow re-encodes that image for any other raster extension.
+    """
 
     figure = plt.gcf()
+    screen_dpi = figure.dpi
+    figure.set_dpi(_EXPORT_DPI)  # text extents depend on the resolution they are measured at
+    try:
+        figure.draw_without_rendering()
+        bbox = figure.get_tightbbox(figure.canvas.get_renderer()).padded(
+            plt.rcParams["savefig.pad_inches"]
+        )
+    finally:
+        figure.set_dpi(screen_dpi)
+    png: Optional[bytes] = None
     for extension in formats:
         target = path.with_suffix(f".{extension}")
         LOGGER.info("Saving figure to %s", target)
-        figure.savefig(target, dpi=600, bbox_inches="tight")
+        if extension.lower() not in _RASTER_FORMATS:
+            figure.savefig(target, dpi=_EXPORT_DPI, bbox_inches=bbox)
+            continue
+        if png is None:
+            buffer = io.BytesIO()
+            figure.savefig(buffer, format="png", dpi=_EXPORT_DPI, bbox_inches=bbox)
+            png = buffer.getvalue()
+        if extension.lower() == "png":
+            target.write_bytes(png)
+        else:
+            _encode_raster(png, target, extension.lower())
+
+
+def _encode_raster(png: bytes, target: Path, extension: str) -> None:
+    from PIL import Image
+
+    with Image.open(io.BytesIO(png)) as image:
+        if extension in _OPAQUE_FORMATS:
+            background = Image.new("RGBA", image.size, "white")
+            image = Image.alpha_composite(background, image.convert("RGBA")).convert("RGB")
+        image.save(target, dpi=(_EXPORT_DPI, _EXPORT_DPI))
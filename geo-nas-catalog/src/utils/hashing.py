@@ -2,14 +2,33 @@
 from __future__ import annotations
 
 import hashlib
+import mmap
+import os
 from pathlib import Path
 
+MMAP_THRESHOLD = 8 * 1024 * 1024
+"""Files at least this large are hashed through a single ``mmap`` view."""
 
-def file_sha1(path: Path, chunk_size: int = 2**20) -> str:
-    """Compute a streaming SHA1 checksum for ``path``."""
+
+def file_sha1(path: Path, chunk_size: int = 2**20, mmap_threshold: int = MMAP_THRESHOLD) -> str:
+    """Compute a streaming SHA1 checksum for ``path``.
+
+    Large files are mapped and handed to :mod:`hashlib` in one ``update`` call so
+    the digest loop runs without the GIL; smaller files (and files that cannot be
+    mapped) are read in ``chunk_size`` blocks into a reused buffer.
+    """
 
     digest = hashlib.sha1()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(chunk_size), b""):
-            digest.update(chunk)
+    with path.open("rb", buffering=0) as handle:
+        if os.fstat(handle.fileno()).st_size >= mmap_threshold:
+            try:
+                with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    digest.update(mapped)
+                return digest.hexdigest()
+            except (ValueError, OSError):
+                pass  # empty file or a filesystem without mmap support
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        while read := handle.readinto(buffer):
+            digest.update(view[:read])
     return digest.hexdigest()
@@ -14,8 +14,16 @@ def configure_logging(level: str = "INFO") -> None:
     logger.add(lambda msg: print(msg, end=""), level=level)
 
     class LoguruHandler(logging.Handler):
+        # The options object is immutable, so records without exception info share one.
+        _bridge = logger.opt(depth=6)
+
         def emit(self, record: logging.LogRecord) -> None:
-            logger.opt(depth=6, exception=record.exc_info).log(record.levelname, record.getMessage())
+            bridge = (
+                self._bridge
+                if record.exc_info is None
+                else logger.opt(depth=6, exception=record.exc_info)
+            )
+            bridge.log(record.levelname, record.getMessage())
 
     logging.basicConfig(handlers=[LoguruHandler()], level=level)
 
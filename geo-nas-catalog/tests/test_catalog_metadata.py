@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from catalog import CatalogEntry, CatalogSummary, CatalogWriter
+
+
+def _entry(name: str, fmt: str, size: int) -> CatalogEntry:
+    return CatalogEntry(
+        path=Path(name),
+        rel_path=Path(name),
+        format=fmt,
+        size_bytes=size,
+        modified_utc=datetime(2024, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def test_summary_from_arrays_matches_from_entries() -> None:
+    formats = ["csv", "netcdf", "csv", "other"]
+    entries = [_entry(f"f{i}", fmt, i * 10) for i, fmt in enumerate(formats)]
+    names = ["csv", "netcdf", "other", "xlsx"]
+    codes = np.array([names.index(entry.format) for entry in entries])
+    sizes = np.array([entry.size_bytes for entry in entries])
+    assert CatalogSummary.from_arrays(sizes, codes, names) == CatalogSummary.from_entries(entries)
+
+
+@pytest.mark.parametrize("codes", [[0, 2], [-1, 0]])
+def test_summary_from_arrays_rejects_out_of_range_codes(codes: list) -> None:
+    with pytest.raises(ValueError, match="format codes"):
+        CatalogSummary.from_arrays(np.array([1, 2]), np.array(codes), ["csv", "netcdf"])
+
+
+def test_summary_from_empty_arrays() -> None:
+    summary = CatalogSummary.from_arrays(np.array([]), np.array([]), [])
+    assert summary.total_entries == 0
+    assert summary.total_size_bytes == 0
+    assert summary.formats == {}
+
+
+def test_summary_from_entries_accepts_generator() -> None:
+    entries = (_entry(f"f{i}", "csv", 5) for i in range(3))
+    summary = CatalogSummary.from_entries(entries)
+    assert (summary.total_entries, summary.total_size_bytes, summary.formats) == (3, 15, {"csv": 3})
+
+
+def test_write_parquet_round_trips_records(tmp_path: Path) -> None:
+    import pyarrow.parquet as pq
+
+    from catalog.parquet import CATALOG_SCHEMA, write_parquet
+
+    entry = _entry("a.nc", "netcdf", 42).model_copy(
+        update={
+            "units": {"t": "K"},
+            "extent": {"lat_min": -10.5},
+            "time_coverage": ("2000", "2001"),
+        }
+    )
+    records = [entry.model_dump(mode="json"), _entry("b.csv", "csv", 1).model_dump(mode="json")]
+    target = tmp_path / "catalog.parquet"
+    assert write_parquet(iter(records), target, batch_rows=1) == 2
+    table = pq.read_table(target)
+    assert table.schema == CATALOG_SCHEMA
+    assert table.column("size_bytes").to_pylist() == [42, 1]
+    assert table.column("extent").to_pylist() == ['{"lat_min":-10.5}', None]
+    assert table.column("modified_utc")[0].as_py() == datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def test_catalog_writer_batches_jsonl_and_parquet(tmp_path: Path) -> None:
+    import pyarrow.parquet as pq
+
+    from catalog.parquet import records_to_table
+
+    entries = [_entry(f"f{i}.csv", "csv", i) for i in range(4)]
+    entries.append(
+        _entry("dir/a.nc", "netcdf", 4).model_copy(
+            update={
+                "units": {"t": "K"},
+                "extent": {"lat_min": -10.5},
+                "time_coverage": ("2000", "2001"),
+                "readme_path": Path("dir/README.md"),
+                "missing_value": -999,
+            }
+        )
+    )
+    jsonl_path = tmp_path / "out" / "catalog.jsonl"
+    parquet_path = tmp_path / "out" / "catalog.parquet"
+    with CatalogWriter(jsonl_path, parquet_path=parquet_path, batch_size=2) as writer:
+        writer.extend(entries)
+    assert writer.count == 5
+    lines = jsonl_path.read_bytes().splitlines()
+    assert [CatalogEntry.model_validate_json(line) for line in lines] == entries
+    parquet_file = pq.ParquetFile(parquet_path)
+    assert parquet_file.metadata.num_row_groups == 3
+    expected = records_to_table([entry.model_dump(mode="json") for entry in entries])
+    assert parquet_file.read().equals(expected)
+
+
+def test_to_jsonl_round_trips_through_validation() -> None:
+    entry = _entry("dir/a.nc", "netcdf", 7).model_copy(
+        update={"readme_path": Path("dir/README.md"), "time_coverage": ("2000", "2001")}
+    )
+    line = entry.to_jsonl()
+    assert line.endswith(b"\n")
+    assert CatalogEntry.model_validate_json(line) == entry
+
+
+def test_entry_rejects_unknown_format() -> None:
+    with pytest.raises(ValidationError):
+        _entry("a.bin", "binary", 1)
+
+
+def test_schema_as_record_fast_matches_as_record() -> None:
+    from catalog import schema
+
+    entry = schema.CatalogEntry(
+        path=Path("dir/a.nc"),
+        rel_path=Path("a.nc"),
+        format="netcdf",
+        size_bytes=3,
+        modified_utc=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        time_coverage=("2000", "2001"),
+        readme_path=Path("dir/README.md"),
+        units={"t": "K"},
+    )
+    assert entry.as_record_fast() == entry.as_record()
+    assert list(entry.as_record_fast()) == list(entry.as_record())
+
+
+def test_scan_state_round_trips_and_reads_legacy_json(tmp_path: Path) -> None:
+    from catalog.schema import ScanState
+
+    state = ScanState()
+    state.update(Path("/data/a.nc"), 10.0)
+    state.save(tmp_path / "state.bin")
+    loaded = ScanState.load(tmp_path / "state.bin")
+    assert loaded.processed == state.processed
+    assert loaded.should_skip(Path("/data/a.nc"), 9.5)
+    assert not loaded.should_skip(Path("/data/b.nc"), 0.0)
+    legacy = tmp_path / "state.json"
+    legacy.write_text('{"processed": {"/data/a.nc": 10.0}}')
+    assert ScanState.load(legacy).processed == state.processed
+    assert ScanState.load(tmp_path / "missing").processed == {}
@@ -36,3 +36,131 @@ def test_scanner_discovers_netcdf(tmp_path: Path) -> None:
     entries = list(scanner.scan(ScanConfig(root=tmp_path, include_suffixes=(".nc",))))
     assert entries[0].format == "netcdf"
     assert "temperature" in entries[0].variables
+
+
+def test_netcdf_time_coverage_skips_fill_values(tmp_path: Path) -> None:
+    netcdf_path = tmp_path / "filled.nc"
+    time = xr.Variable("time", [0.0, 1.0, -999.0], {"units": "days since 2000-01-01"})
+    time.encoding["_FillValue"] = -999.0
+    ds = xr.Dataset({"temperature": ("time", [10.0, 11.0, 12.0])}, coords={"time": time})
+    ds.attrs.update(geospatial_lat_min=-10.0, geospatial_lat_max=float("nan"))
+    ds.to_netcdf(netcdf_path, encoding={"time": {"_FillValue": -999.0}})
+    scanner = CatalogScanner()
+    entries = list(scanner.scan(ScanConfig(root=tmp_path, include_suffixes=(".nc",))))
+    assert entries[0].time_coverage == ("2000-01-01 00:00:00", "2000-01-02 00:00:00")
+    assert entries[0].extent == {"lat_min": -10.0}
+
+
+def test_scanner_walks_nested_directories(tmp_path: Path) -> None:
+    for index in range(3):
+        nested = tmp_path / f"level{index}" / "inner"
+        nested.mkdir(parents=True)
+        _create_csv(nested / f"data{index}.csv")
+    excluded = tmp_path / ".git"
+    excluded.mkdir()
+    _create_csv(excluded / "ignored.csv")
+    scanner = CatalogScanner()
+    entries = list(scanner.scan(ScanConfig(root=tmp_path, workers=4)))
+    names = sorted(entry.rel_path.name for entry in entries)
+    assert names == ["data0.csv", "data1.csv", "data2.csv"]
+
+
+def test_scanner_follows_file_symlinks_only_when_requested(tmp_path: Path) -> None:
+    target = tmp_path / "outside"
+    target.mkdir()
+    _create_csv(target / "linked.csv")
+    root = tmp_path / "root"
+    root.mkdir()
+    _create_csv(root / "data.csv")
+    (root / "link.csv").symlink_to(target / "linked.csv")
+    scanner = CatalogScanner()
+    names = sorted(entry.rel_path.name for entry in scanner.scan(ScanConfig(root=root)))
+    assert names == ["data.csv"]
+    followed = scanner.scan(ScanConfig(root=root, follow_symlinks=True))
+    assert sorted(entry.rel_path.name for entry in followed) == ["data.csv", "link.csv"]
+
+
+def test_scanner_can_be_closed_early(tmp_path: Path) -> None:
+    for index in range(20):
+        _create_csv(tmp_path / f"data{index}.csv")
+    scan = CatalogScanner().scan(ScanConfig(root=tmp_path, workers=2))
+    first = next(scan)
+    scan.close()
+    assert first.format == "csv"
+
+
+def test_scanner_falls_back_to_generic_handler(tmp_path: Path) -> None:
+    (tmp_path / "blob.BIN").write_bytes(b"\x00\x01")
+    _create_csv(tmp_path / "DATA.CSV")
+    entries = list(CatalogScanner().scan(ScanConfig(root=tmp_path)))
+    formats = {entry.rel_path.name: entry.format for entry in entries}
+    assert formats == {"blob.BIN": "other", "DATA.CSV": "csv"}
+
+
+def test_scanner_reads_tabular_headers(tmp_path: Path) -> None:
+    (tmp_path / "semicolon.csv").write_text("lat;lon;value\n1;2;3\n4;5;6\n")
+    (tmp_path / "empty.txt").write_text("")
+    pd.DataFrame({"station": ["a"], "rain": [1.5]}).to_excel(tmp_path / "sheet.xlsx", index=False)
+    scan = CatalogScanner().scan(ScanConfig(root=tmp_path))
+    entries = {entry.rel_path.name: entry for entry in scan}
+    assert entries["semicolon.csv"].variables == ["lat", "lon", "value"]
+    assert entries["sheet.xlsx"].variables == ["station", "rain"]
+    assert entries["empty.txt"].variables == []
+    assert entries["empty.txt"].curation_notes == "No header row detected"
+
+
+def test_scanner_computes_checksums_when_requested(tmp_path: Path) -> None:
+    import hashlib
+
+    (tmp_path / "blob.bin").write_bytes(b"payload")
+    (plain,) = CatalogScanner().scan(ScanConfig(root=tmp_path))
+    assert plain.checksum_sha1 is None
+    (hashed,) = CatalogScanner().scan(ScanConfig(root=tmp_path, compute_checksums=True))
+    assert hashed.checksum_sha1 == hashlib.sha1(b"payload").hexdigest()
+
+
+def test_scanner_sniffs_files_with_unknown_suffixes(tmp_path: Path) -> None:
+    from catalog.handlers import CSVHandler, GenericHandler
+
+    class HeaderSniffingCSV(CSVHandler):
+        def sniff(self, path: Path) -> bool:
+            with path.open("rb") as handle:
+                return handle.read(4) == b"a,b\n"
+
+    (tmp_path / "export.dat").write_text("a,b\n1,2\n")
+    (tmp_path / "blob.dat").write_bytes(b"\x00\x01")
+    _create_csv(tmp_path / "known.csv")
+    scanner = CatalogScanner([HeaderSniffingCSV(), GenericHandler()])
+    entries = {entry.rel_path.name: entry for entry in scanner.scan(ScanConfig(root=tmp_path))}
+    assert entries["export.dat"].variables == ["a", "b"]
+    assert entries["blob.dat"].format == "other"
+    assert entries["known.csv"].format == "csv"
+
+
+def test_scan_batched_respects_batch_size(tmp_path: Path) -> None:
+    for index in range(7):
+        _create_csv(tmp_path / f"table_{index}.csv")
+    scanner = CatalogScanner()
+    batches = list(scanner.scan_batched(ScanConfig(root=tmp_path, workers=2), batch_size=3))
+    assert all(1 <= len(batch) <= 3 for batch in batches)
+    assert sorted(entry.rel_path.name for batch in batches for entry in batch) == sorted(
+        f"table_{index}.csv" for index in range(7)
+    )
+    assert scanner.summarize_scan(ScanConfig(root=tmp_path)) == {"csv": 7}
+
+
+def test_scanner_skips_files_recorded_in_state(tmp_path: Path) -> None:
+    import os
+
+    from catalog.schema import ScanState
+
+    _create_csv(tmp_path / "old.csv")
+    _create_csv(tmp_path / "new.csv")
+    state = ScanState()
+    scanner = CatalogScanner()
+    assert len(list(scanner.scan(ScanConfig(root=tmp_path, state=state)))) == 2
+    assert list(scanner.scan(ScanConfig(root=tmp_path, state=state))) == []
+    stat = (tmp_path / "new.csv").stat()
+    os.utime(tmp_path / "new.csv", (stat.st_atime, stat.st_mtime + 10))
+    rescanned = list(scanner.scan(ScanConfig(root=tmp_path, state=state)))
+    assert [entry.rel_path.name for entry in rescanned] == ["new.csv"]
@@ -3,6 +3,8 @@ from __future__ import annotations
 from pathlib import Path
 
 from utils.config import AppConfig, load_config
+from utils.hashing import file_sha1
+from utils.parallel import run_in_executor
 from utils.paths import normalise_path
 
 
@@ -18,3 +20,32 @@ def test_normalise_path(tmp_path: Path) -> None:
     test_path.write_text("data")
     resolved = normalise_path(Path(str(test_path)))
     assert resolved.exists()
+
+
+def test_file_sha1_mmap_and_chunked_paths_agree(tmp_path: Path) -> None:
+    import hashlib
+
+    payload = bytes(range(256)) * 1000
+    path = tmp_path / "blob.bin"
+    path.write_bytes(payload)
+    expected = hashlib.sha1(payload).hexdigest()
+    assert file_sha1(path, chunk_size=4096, mmap_threshold=len(payload) + 1) == expected
+    assert file_sha1(path, mmap_threshold=0) == expected
+    empty = tmp_path / "empty.bin"
+    empty.touch()
+    assert file_sha1(empty, mmap_threshold=0) == hashlib.sha1(b"").hexdigest()
+
+
+def test_run_in_executor_forwards_arguments() -> None:
+    import asyncio
+    import threading
+
+    def work(x: int, y: int = 0) -> tuple[int, str]:
+        return x + y, threading.current_thread().name
+
+    async def main() -> tuple[int, str]:
+        return await run_in_executor(work, 1, y=2)
+
+    total, thread_name = asyncio.run(main())
+    assert total == 3
+    assert thread_name != threading.main_thread().name
@@ -16,16 +16,23 @@
 
 import os
 import sys
+import random
+import re
 import argparse
 import sqlite3
 import hashlib
+import mmap
 import threading
 import time
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from queue import Queue, Empty
+from queue import Full, Queue
 import fnmatch
 import mimetypes
+import functools
+import itertools
+from operator import itemgetter
+from collections import deque, namedtuple
 
 try:
     from tqdm import tqdm
@@ -62,6 +69,16 @@ CREATE INDEX IF NOT EXISTS idx_sha256 ON files(sha256);
 CREATE INDEX IF NOT EXISTS idx_dev_inode ON files(dev, inode);
 """
 
+# WAL 模式下 synchronous=NORMAL 只在 checkpoint 时 fsync，崩溃不会损坏数据库
+SQLITE_PRAGMAS = """
+PRAGMA synchronous = NORMAL;
+PRAGMA temp_store = MEMORY;
+PRAGMA cache_size = -65536;
+PRAGMA mmap_size = 10737418240;
+PRAGMA busy_timeout = 5000;
+PRAGMA wal_autocheckpoint = 10000;
+"""
+
 # ------- 辅助函数 -------
 def safe_stat(path, follow_symlinks=True):
     try:
@@ -70,98 +87,323 @@ def safe_stat(path, follow_symlinks=True):
         logger.debug("stat failed: %s -> %s", path, e)
         return None
 
+HASH_MMAP_THRESHOLD = 1 << 20  # 小于 1 MiB 的文件一次 read()，更大的文件用 mmap
+HASH_INLINE_MAX = 64 * 1024  # 小于该大小的文件在目录线程内直接计算哈希，省去线程池调度
+HASH_PENDING_PER_THREAD = 64  # 每个哈希线程允许排队的文件数，防止内存无限增长
+
+def _fadvise(fd, advice):
+    # posix_fadvise 只是提示，macOS/Windows 上不存在，失败也无需处理
+    if hasattr(os, "posix_fadvise"):
+        try:
+            os.posix_fadvise(fd, 0, 0, getattr(os, advice))
+        except OSError:
+            pass
+
 def sha256_file(path, block_size=4 * 1024 * 1024):
     h = hashlib.sha256()
     try:
         with open(path, "rb") as f:
-            while True:
-                data = f.read(block_size)
-                if not data:
-                    break
-                h.update(data)
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return h.hexdigest()
+            if size < HASH_MMAP_THRESHOLD:
+                h.update(f.read())
+                return h.hexdigest()
+            fd = f.fileno()
+            _fadvise(fd, "POSIX_FADV_SEQUENTIAL")
+            try:
+                try:
+                    # 整个文件映射后一次 update，hashlib 在释放 GIL 的情况下直接遍历页面
+                    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                        if hasattr(mm, "madvise"):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        h.update(mm)
+                    return h.hexdigest()
+                except (ValueError, OSError):
+                    pass  # 某些网络文件系统不支持 mmap，退回分块读取
+                while True:
+                    data = f.read(block_size)
+                    if not data:
+                        break
+                    h.update(data)
+            finally:
+                # 大文件只读一次，哈希后立即丢弃其页缓存，避免挤掉其他热数据
+                _fadvise(fd, "POSIX_FADV_DONTNEED")
         return h.hexdigest()
     except (PermissionError, FileNotFoundError, OSError) as e:
         logger.debug("hash failed: %s -> %s", path, e)
         return None
 
-def guess_mime(path):
-    m, _ = mimetypes.guess_type(path)
+def compile_name_pattern(pattern):
+    # 与 fnmatch.fnmatch 语义一致：glob 只翻译一次；文件名不区分大小写的平台上忽略大小写
+    flags = re.IGNORECASE if os.path.normcase("A") == "a" else 0
+    return re.compile(fnmatch.translate(pattern), flags)
+
+@functools.lru_cache(maxsize=4096)
+def _mime_for_suffix(suffix):
+    m, _ = mimetypes.guess_type("x" + suffix)
     return m or "application/octet-stream"
 
+def guess_mime(path):
+    # MIME 只取决于扩展名：按扩展名缓存，每种扩展名只调用一次 guess_type。
+    # 压缩后缀（.gz 等）需连同前一个扩展名一起判断（.tar.gz -> application/x-tar）
+    stem, suffix = os.path.splitext(os.path.basename(path))
+    if suffix.lower() in mimetypes.encodings_map:
+        suffix = os.path.splitext(stem)[1] + suffix
+    return _mime_for_suffix(suffix)
+
 # ------- SQLite 持久化 -------
+UPSERT_BATCH_SIZE = 1000  # 每批累计多少行后统一提交一次事务
+
+_UPSERT_SQL = """
+INSERT INTO files(path,size,mtime,atime,ctime,mode,uid,gid,dev,inode,sha256,mime,scanned_at)
+VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?)
+ON CONFLICT(path) DO UPDATE SET
+  size=excluded.size,
+  mtime=excluded.mtime,
+  atime=excluded.atime,
+  ctime=excluded.ctime,
+  mode=excluded.mode,
+  uid=excluded.uid,
+  gid=excluded.gid,
+  dev=excluded.dev,
+  inode=excluded.inode,
+  sha256=excluded.sha256,
+  mime=excluded.mime,
+  scanned_at=excluded.scanned_at
+"""
+
+# 一条文件记录；字段顺序与 _UPSERT_SQL 的占位符一致，可直接作为 executemany 的参数
+FileRow = namedtuple(
+    "FileRow", "path size mtime atime ctime mode uid gid dev inode sha256 mime scanned_at"
+)
+
+def _as_row(meta):
+    # 兼容以 dict 传入记录的调用者
+    if isinstance(meta, tuple):
+        return meta
+    return FileRow(*(meta.get(field) for field in FileRow._fields))
+
+# 第二遍哈希只更新 sha256 列；字段顺序与 _UPDATE_SHA_SQL 的占位符一致
+ShaUpdate = namedtuple("ShaUpdate", "sha256 path")
+
+_UPDATE_SHA_SQL = "UPDATE files SET sha256=? WHERE path=?"
+
+_WRITER_STOP = object()  # 通知写线程提交剩余记录并退出
+_WRITER_POLL_SECONDS = 1.0  # 入队/等待 flush 时检查写线程是否存活的间隔
+WRITER_CLOSE_TIMEOUT = 60  # close() 等待写线程提交剩余记录的最长秒数
+
 class DB:
-    def __init__(self, path):
+    """
+    WAL 模式下的“单写多读”：所有写入经队列交给专用写线程（持有自己的连接）批量提交；
+    读取使用每个线程各自的只读连接，无需应用层锁。
+    """
+
+    def __init__(self, path, batch_size=UPSERT_BATCH_SIZE):
         self.path = path
-        self._lock = threading.Lock()
-        self._conn = sqlite3.connect(self.path, check_same_thread=False)
-        self._conn.execute("PRAGMA journal_mode = WAL;")
-        self._conn.executescript(SQLITE_SCHEMA)
-        self._conn.commit()
+        self.batch_size = max(1, batch_size)
+        self._writer_conn = self._connect()
+        # 写连接由自己管理事务：每批一个 BEGIN IMMEDIATE ... COMMIT，
+        # 直接获取写锁，不经过 sqlite3 模块隐式的 BEGIN DEFERRED 再升级
+        self._writer_conn.isolation_level = None
+        self._writer_conn.executescript(SQLITE_SCHEMA)
+        self._queue = Queue(maxsize=self.batch_size * 4)
+        self._tls = threading.local()
+        self._readers = []
+        self._readers_lock = threading.Lock()  # 仅保护 _readers 列表，用于 close() 时统一关闭
+        self._writer = threading.Thread(target=self._writer_loop, name="db-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode = WAL;")
+        conn.executescript(SQLITE_PRAGMAS)
+        return conn
+
+    def reader(self):
+        """返回当前线程专用的只读连接（首次调用时创建）"""
+        conn = getattr(self._tls, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            conn.execute("PRAGMA query_only = 1;")
+            self._tls.conn = conn
+            with self._readers_lock:
+                self._readers.append(conn)
+        return conn
 
     def upsert_file(self, meta):
         """
-        meta: dict with keys path,size,mtime,atime,ctime,mode,uid,gid,dev,inode,sha256,mime,scanned_at
+        meta: FileRow（或含 path,size,mtime,atime,ctime,mode,uid,gid,dev,inode,sha256,mime,scanned_at 的 dict）
+        写入并等待提交（单条）；扫描热路径请使用 add_file + flush
         """
-        with self._lock:
-            cur = self._conn.cursor()
-            cur.execute(
-                """
-                INSERT INTO files(path,size,mtime,atime,ctime,mode,uid,gid,dev,inode,sha256,mime,scanned_at)
-                VALUES(?,?,?,?,?,?,?,?,?,?,?,?,?)
-                ON CONFLICT(path) DO UPDATE SET
-                  size=excluded.size,
-                  mtime=excluded.mtime,
-                  atime=excluded.atime,
-                  ctime=excluded.ctime,
-                  mode=excluded.mode,
-                  uid=excluded.uid,
-                  gid=excluded.gid,
-                  dev=excluded.dev,
-                  inode=excluded.inode,
-                  sha256=excluded.sha256,
-                  mime=excluded.mime,
-                  scanned_at=excluded.scanned_at
-                """,
-                (
-                    meta["path"],
-                    meta["size"],
-                    meta["mtime"],
-                    meta["atime"],
-                    meta["ctime"],
-                    meta["mode"],
-                    meta["uid"],
-                    meta["gid"],
-                    meta["dev"],
-                    meta["inode"],
-                    meta.get("sha256"),
-                    meta.get("mime"),
-                    meta["scanned_at"],
-                ),
+        self.upsert_files_batch([meta])
+
+    def upsert_files_batch(self, metas):
+        """写入多条记录并等待写线程提交"""
+        for meta in metas:
+            self._put(_as_row(meta))
+        self.flush()
+
+    def add_file(self, row):
+        """把一条 FileRow 交给写线程；写线程每累计 batch_size 行在一个事务中提交一次"""
+        self._put(row)
+
+    def set_sha256(self, path, sha256):
+        """把一条 sha256 更新交给写线程，与 add_file 的记录一起按批提交"""
+        self._put(ShaUpdate(sha256, path))
+
+    def _put(self, item):
+        # 写线程意外退出后队列不会再被消费：不能无限阻塞在已满的队列上
+        while True:
+            try:
+                self._queue.put(item, timeout=_WRITER_POLL_SECONDS)
+                return True
+            except Full:
+                if not self._writer.is_alive():
+                    logger.error("DB writer thread is not running; record dropped")
+                    return False
+
+    def flush(self):
+        """等待写线程提交此前排队的所有记录；写线程已退出时返回 False"""
+        done = threading.Event()
+        if not self._put(done):
+            return False
+        while not done.wait(_WRITER_POLL_SECONDS):
+            if not self._writer.is_alive():
+                logger.error("DB writer thread is not running; flush abandoned")
+                return False
+        return True
+
+    def _writer_loop(self):
+        pending = []
+        updates = []
+        while True:
+            item = self._queue.get()
+            if isinstance(item, tuple):
+                if type(item) is ShaUpdate:
+                    updates.append(item)
+                else:
+                    pending.append(item)
+                if len(pending) + len(updates) < self.batch_size:
+                    continue
+            # 批次已满、flush 请求或退出信号：先提交缓冲区
+            try:
+                if pending or updates:
+                    self._write_rows(pending, updates)
+            except Exception:
+                # 写线程不能因异常退出，否则队列写满后 add_file/flush 会永久阻塞
+                logger.exception("DB writer failed to store %d rows", len(pending) + len(updates))
+            pending = []
+            updates = []
+            if item is _WRITER_STOP:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+
+    def _write_rows(self, rows, updates=()):
+        conn = self._writer_conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # 同一事务内先写入记录再更新 sha256，保证同一路径的更新落在记录之后
+            if rows:
+                conn.executemany(_UPSERT_SQL, rows)
+            if updates:
+                conn.executemany(_UPDATE_SHA_SQL, updates)
+            conn.execute("COMMIT")
+        except Exception as e:
+            # 整批失败（例如某个路径无法编码为 UTF-8、inode 超出 SQLite 整数范围）：
+            # 回滚后逐行重写，只丢弃出错的那几行
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.debug("DB batch failed (%d rows), retrying row by row: %s", len(rows) + len(updates), e)
+            self._write_rows_one_by_one(rows, updates)
+
+    def _write_rows_one_by_one(self, rows, updates):
+        conn = self._writer_conn
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            # FileRow 的 path 在第 0 列，ShaUpdate 的 path 在第 1 列
+            statements = [(_UPSERT_SQL, row, row[0]) for row in rows]
+            statements += [(_UPDATE_SHA_SQL, update, update[1]) for update in updates]
+            for sql, params, path in statements:
+                try:
+                    conn.execute(sql, params)
+                except Exception as e:
+                    # 路径可能含无法解码的字节（surrogateescape），用 %r 记录以免日志本身出错
+                    logger.warning("DB upsert failed for %r: %s", path, e)
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.warning("DB batch upsert failed (%d rows): %s", len(rows) + len(updates), e)
+
+    def load_resume_index(self, chunk_size=10000):
+        """一次性读出 {path: (size, mtime)}，断点续传时在内存中判断文件是否变化"""
+        index = {}
+        cur = self.reader().execute("SELECT path, size, mtime FROM files")
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+            for path, size, mtime in rows:
+                index[path] = (size, mtime)
+        return index
+
+    def iter_hash_candidates(self, root):
+        """root 下未计算 sha256、且大小与 root 下其他文件相同的路径（大小不同的文件不可能重复）"""
+        # root 下的路径恰好落在 [root/, root0) 区间内（"0" 紧跟在 "/" 之后），可直接走 path 的唯一索引；
+        # 已有 sha256 的文件仍参与大小计数：新文件与它们大小相同时同样需要计算哈希
+        prefix = root if root.endswith(os.sep) else root + os.sep
+        upper = prefix[:-1] + chr(ord(os.sep) + 1)
+        cur = self.reader().execute(
+            """
+            SELECT path FROM files
+            WHERE path >= ?1 AND path < ?2 AND sha256 IS NULL AND size IN (
+                SELECT size FROM files
+                WHERE path >= ?1 AND path < ?2
+                GROUP BY size HAVING COUNT(*) > 1
             )
-            self._conn.commit()
+            """,
+            (prefix, upper),
+        )
+        for (path,) in cur:
+            yield path
 
     def find_duplicates(self):
-        with self._lock:
-            cur = self._conn.cursor()
-            cur.execute(
-                """
-                SELECT sha256, COUNT(*) c FROM files
+        # 一次查询按 sha256 顺序取出所有重复记录，再在内存中分组（避免每组一次查询）
+        cur = self.reader().execute(
+            """
+            SELECT sha256, path, size, mtime FROM files
+            WHERE sha256 IN (
+                SELECT sha256 FROM files
                 WHERE sha256 IS NOT NULL
-                GROUP BY sha256 HAVING c > 1
-                """
+                GROUP BY sha256 HAVING COUNT(*) > 1
             )
-            rows = cur.fetchall()
-            dup_map = {}
-            for sha, cnt in rows:
-                cur.execute("SELECT path,size,mtime FROM files WHERE sha256=? ORDER BY path", (sha,))
-                dup_map[sha] = cur.fetchall()
-            return dup_map
+            ORDER BY sha256, path
+            """
+        )
+        dup_map = {}
+        for sha, group in itertools.groupby(cur, key=itemgetter(0)):
+            dup_map[sha] = [(path, size, mtime) for _, path, size, mtime in group]
+        return dup_map
 
     def close(self):
-        with self._lock:
-            self._conn.close()
+        if self._writer.is_alive() and self._put(_WRITER_STOP):
+            self._writer.join(WRITER_CLOSE_TIMEOUT)
+        if self._writer.is_alive():
+            # 写线程仍在使用连接，不能在这里关闭它
+            logger.error("DB writer did not stop within %d s", WRITER_CLOSE_TIMEOUT)
+        else:
+            self._writer_conn.close()
+        with self._readers_lock:
+            for conn in self._readers:
+                conn.close()
+            self._readers.clear()
 
 # ------- 主扫描器 -------
+VISITED_SHARDS = 32  # 已访问 inode 集合的分片数（须为 2 的幂）
+DEFAULT_IO_THREADS = 32  # 默认目录遍历线程数，与哈希线程数（--threads）分开设置
+
 class NASScanner:
     def __init__(
         self,
@@ -170,40 +412,64 @@ class NASScanner:
         follow_symlinks=False,
         compute_hash=False,
         threads=8,
+        io_threads=None,
         pattern=None,
         min_size=0,
         max_size=None,
         resume=True,
+        two_pass=False,
     ):
         self.root = os.path.abspath(root)
         self.follow_symlinks = follow_symlinks
         self.compute_hash = compute_hash
         self.threads = max(1, threads)
+        # 目录遍历线程数：scandir/stat 主要在等待 NAS 往返，远多于 CPU 核数的线程也不会抢占 CPU
+        self.io_threads = max(1, io_threads or DEFAULT_IO_THREADS)
         self.pattern = pattern
+        self._name_re = compile_name_pattern(pattern) if pattern else None
         self.min_size = min_size
         self.max_size = max_size
         self.resume = resume
+        # 两遍模式：第一遍只遍历记录元数据，第二遍只对大小相同的文件计算哈希
+        self.two_pass = two_pass
 
         self.db = DB(dbpath)
         self.scanned_at = time.time()
         # 为防止符号链接或重复 device/inode 导致的无限循环，跟踪已访问的 (dev, inode)
-        self.visited_inodes = set()
-        self.visited_lock = threading.Lock()
-        self.dir_queue = Queue()
-        self.file_futures = []
+        # 按 (dev ^ inode) 分片，每片一把锁，目录线程很少争用同一把锁
+        self._visited_shards = [set() for _ in range(VISITED_SHARDS)]
+        self._visited_locks = [threading.Lock() for _ in range(VISITED_SHARDS)]
+        # 目录工作队列：每个线程一个 deque（scan() 中创建），空闲线程在条件变量上等待
+        self._dir_deques = []
+        self._idle_cond = threading.Condition()
+        self._idle_workers = 0
+        self._walk_done = False
         self.progress = None
+        # 断点续传索引：{path: (size, mtime)}，scan() 开始时从数据库一次性加载
+        self._resume_index = {}
+        # 哈希线程池（compute_hash 时在 scan() 中创建）；信号量限制排队中的任务数
+        self.hash_pool = None
+        self._hash_slots = threading.BoundedSemaphore(self.threads * HASH_PENDING_PER_THREAD)
 
     def should_skip_by_name(self, name):
-        if self.pattern is None:
-            return False
-        return not fnmatch.fnmatch(name, self.pattern)
+        return self._name_re is not None and self._name_re.match(name) is None
+
+    def _entry_stat(self, entry):
+        # DirEntry.stat() 会缓存结果（Windows 上直接来自目录列表），避免对同一条目重复 stat
+        try:
+            return entry.stat(follow_symlinks=self.follow_symlinks)
+        except OSError as e:
+            logger.debug("stat failed: %s -> %s", entry.path, e)
+            return None
 
     def mark_visited(self, st):
         key = (st.st_dev, st.st_ino)
-        with self.visited_lock:
-            if key in self.visited_inodes:
+        i = (st.st_dev ^ st.st_ino) & (VISITED_SHARDS - 1)
+        shard = self._visited_shards[i]
+        with self._visited_locks[i]:
+            if key in shard:
                 return False
-            self.visited_inodes.add(key)
+            shard.add(key)
             return True
 
     def process_file(self, path, st):
@@ -213,81 +479,65 @@ class NASScanner:
             logger.debug("skip by size: %s (%d)", path, size)
             return None
 
-        # 决定是否需要计算 sha256（可以并行）
-        sha = None
-        if self.compute_hash:
-            sha = sha256_file(path)
-
-        meta = {
-            "path": path,
-            "size": size,
-            "mtime": st.st_mtime,
-            "atime": st.st_atime,
-            "ctime": st.st_ctime,
-            "mode": st.st_mode,
-            "uid": st.st_uid,
-            "gid": st.st_gid,
-            "dev": st.st_dev,
-            "inode": st.st_ino,
-            "sha256": sha,
-            "mime": guess_mime(path),
-            "scanned_at": self.scanned_at,
-        }
-
-        # 写入数据库（断点续传模式下会替换）
+        # 较大的文件交给独立的哈希线程池，目录线程继续遍历；小文件直接在当前线程计算
+        sha256 = None
+        if self.compute_hash and not self.two_pass:
+            if self.hash_pool is not None and size >= HASH_INLINE_MAX:
+                row = self._file_row(path, st, None)
+                self._hash_slots.acquire()
+                self.hash_pool.submit(self._hash_and_store, row)
+                return row
+            sha256 = sha256_file(path)
+
+        # 写入数据库缓冲区（断点续传模式下会替换），按批提交
+        row = self._file_row(path, st, sha256)
+        self.db.add_file(row)
+        return row
+
+    def _file_row(self, path, st, sha256):
+        return FileRow(
+            path,
+            st.st_size,
+            st.st_mtime,
+            st.st_atime,
+            st.st_ctime,
+            st.st_mode,
+            st.st_uid,
+            st.st_gid,
+            st.st_dev,
+            st.st_ino,
+            sha256,
+            guess_mime(path),
+            self.scanned_at,
+        )
+
+    def _hash_and_store(self, row):
         try:
-            self.db.upsert_file(meta)
+            self.db.add_file(row._replace(sha256=sha256_file(row.path)))
         except Exception as e:
-            logger.warning("DB upsert failed for %s: %s", path, e)
-        return meta
+            logger.warning("hash/store failed for %s: %s", row.path, e)
+        finally:
+            self._hash_slots.release()
 
-    def walk_worker(self):
-        # 单个线程的目录处理器：从队列取目录并扫描条目
-        while True:
-            try:
-                dirpath = self.dir_queue.get(timeout=1)
-            except Empty:
-                return
-            try:
-                with os.scandir(dirpath) as it:
-                    for entry in it:
-                        try:
-                            # 选择是否跟随符号链接
-                            st = safe_stat(entry.path, follow_symlinks=self.follow_symlinks)
-                            if st is None:
-                                continue
-                            # 目录 -> 入队
-                            if entry.is_dir(follow_symlinks=self.follow_symlinks):
-                                # 防止同一 inode 重复走入（符号链接环等）
-                                if self.mark_visited(st):
-                                    self.dir_queue.put(entry.path)
-                                else:
-                                    logger.debug("skip visited dir(inode): %s", entry.path)
-                                continue
-                            # 文件 -> 提交文件处理（计算 metadata/hash 并入库）
-                            if entry.is_file(follow_symlinks=self.follow_symlinks):
-                                if self.should_skip_by_name(entry.name):
-                                    logger.debug("skip by pattern: %s", entry.path)
-                                    continue
-                                # 如果 resume 且没有变化可以跳过：检查 DB 中当前记录
-                                if self.resume:
-                                    # 快速检查是否已存在且 mtime/size 未变
-                                    cur = self.db._conn.cursor()
-                                    cur.execute("SELECT size,mtime,sha256 FROM files WHERE path=?", (entry.path,))
-                                    row = cur.fetchone()
-                                    if row and row[0] == st.st_size and row[1] == st.st_mtime:
-                                        logger.debug("resume skip unchanged: %s", entry.path)
-                                        continue
-                                # 提交到线程池（这里使用相同线程池做文件处理）
-                                yield (entry.path, st)
-            except PermissionError as e:
-                logger.warning("Permission denied: %s -> %s", dirpath, e)
-            except FileNotFoundError:
-                logger.debug("Dir vanished while scanning: %s", dirpath)
-            except OSError as e:
-                logger.warning("OSError scanning %s: %s", dirpath, e)
-            finally:
-                self.dir_queue.task_done()
+    def _hash_and_update(self, path):
+        try:
+            sha256 = sha256_file(path)
+            if sha256 is not None:
+                self.db.set_sha256(path, sha256)
+        except Exception as e:
+            logger.warning("hash/update failed for %s: %s", path, e)
+        finally:
+            self._hash_slots.release()
+
+    def _hash_size_collisions(self):
+        # 第二遍：先提交第一遍的记录，再只对可能重复的文件计算哈希
+        self.db.flush()
+        submitted = 0
+        for path in self.db.iter_hash_candidates(self.root):
+            self._hash_slots.acquire()
+            self.hash_pool.submit(self._hash_and_update, path)
+            submitted += 1
+        logger.info("Two-pass: hashing %d files with colliding sizes", submitted)
 
     def scan(self):
         # 初始化根目录的 inode 跟踪
@@ -295,66 +545,133 @@ class NASScanner:
         if root_stat is None:
             raise FileNotFoundError(self.root)
         self.mark_visited(root_stat)
-        self.dir_queue.put(self.root)
+        if self.resume:
+            self._resume_index = self.db.load_resume_index()
+            logger.info("Loaded resume index: %d files", len(self._resume_index))
+        # 每个目录线程一个双端队列：根目录先放进 0 号线程的队列
+        self._dir_deques = [deque() for _ in range(self.io_threads)]
+        self._dir_deques[0].append(self.root)
+        self._idle_workers = 0
+        self._walk_done = False
 
         # 用线程池并发处理目录和文件
-        pool = ThreadPoolExecutor(max_workers=self.threads)
-        file_futures = []
+        pool = ThreadPoolExecutor(max_workers=self.io_threads, thread_name_prefix="walk")
+        if self.compute_hash:
+            self.hash_pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="hash")
         processed = 0
 
-        # 我们将使用生产-消费模型：多个目录工作者作为生成器产出文件任务
-        # 为了简单实现：每个线程执行 walk_worker 函数，但该函数需要把文件任务以 yield 的形式返回
-        # 这里用另一种方式：主线程循环读取 dir_queue，由线程池并发运行 os.scandir（通过 submit）
+        # 每个线程对自己的队列做深度优先遍历，队列为空时从其他线程的队尾窃取目录，
+        # 所有线程都空闲且所有队列为空时遍历结束
         try:
-            # 初始任务：并发从 dir_queue 取目录并扫描
-            active = []
-            for _ in range(self.threads):
-                active.append(pool.submit(self._dir_scan_loop))
+            active = [pool.submit(self._dir_scan_loop, i) for i in range(self.io_threads)]
 
             # 等待所有目录工作完成
             for fut in as_completed(active):
                 # 返回值为处理文件计数
                 processed += fut.result()
+
+            if self.compute_hash and self.two_pass:
+                self._hash_size_collisions()
         finally:
+            # 异常或中断时让空闲线程尽快退出
+            with self._idle_cond:
+                self._walk_done = True
+                self._idle_cond.notify_all()
             pool.shutdown(wait=True)
-            self.db.close()
+            if self.hash_pool is not None:
+                self.hash_pool.shutdown(wait=True)
+                self.hash_pool = None
+            # 提交剩余不足一批的记录；连接在 main() 生成重复报告后关闭
+            self.db.flush()
         logger.info("Scanning complete. total processed files: %d", processed)
 
-    def _dir_scan_loop(self):
+    def _push_dir(self, index, path):
+        # 子目录压入本线程队列的头部（深度优先）；有空闲线程时唤醒一个来窃取
+        self._dir_deques[index].appendleft(path)
+        if self._idle_workers:
+            with self._idle_cond:
+                self._idle_cond.notify()
+
+    def _steal(self, index):
+        # 从随机起点依次尝试其他线程的队尾（离根最近、子树最大的目录）
+        count = len(self._dir_deques)
+        start = random.randrange(count)
+        for offset in range(count):
+            victim = (start + offset) % count
+            if victim == index:
+                continue
+            try:
+                return self._dir_deques[victim].pop()
+            except IndexError:
+                continue
+        return None
+
+    def _next_dir(self, index):
+        if self._walk_done:
+            return None
+        try:
+            return self._dir_deques[index].popleft()
+        except IndexError:
+            pass
+        dirpath = self._steal(index)
+        if dirpath is not None:
+            return dirpath
+        with self._idle_cond:
+            self._idle_workers += 1
+            try:
+                while True:
+                    if self._walk_done:
+                        return None
+                    dirpath = self._steal(index)
+                    if dirpath is not None:
+                        return dirpath
+                    # 空闲线程的队列只能由其自身填充，全部空闲即说明没有剩余目录
+                    if self._idle_workers == len(self._dir_deques):
+                        self._walk_done = True
+                        self._idle_cond.notify_all()
+                        return None
+                    self._idle_cond.wait()
+            finally:
+                self._idle_workers -= 1
+
+    def _dir_scan_loop(self, index):
         processed_files = 0
-        # 本循环在每个线程中运行，持续消费 dir_queue 中的路径，直到空超时然后退出
+        # 本循环在每个线程中运行，处理自己队列中的目录并在空闲时窃取，直到遍历结束
         while True:
-            try:
-                dirpath = self.dir_queue.get(timeout=1)
-            except Empty:
+            dirpath = self._next_dir(index)
+            if dirpath is None:
                 break
             try:
                 with os.scandir(dirpath) as it:
                     for entry in it:
                         try:
-                            st = safe_stat(entry.path, follow_symlinks=self.follow_symlinks)
-                            if st is None:
-                                continue
+                            # is_dir/is_file 在 Linux 上直接取自 d_type，不产生系统调用；
+                            # 只有需要 (st_dev, st_ino) 的目录和通过名称过滤的文件才 stat
                             if entry.is_dir(follow_symlinks=self.follow_symlinks):
+                                st = self._entry_stat(entry)
+                                if st is None:
+                                    continue
                                 if self.mark_visited(st):
-                                    self.dir_queue.put(entry.path)
+                                    self._push_dir(index, entry.path)
                                 else:
                                     logger.debug("skip visited dir(inode): %s", entry.path)
                                 continue
-                            if entry.is_file(follow_symlinks=self.follow_symlinks):
-                                if self.should_skip_by_name(entry.name):
-                                    continue
-                                # resume 快速跳过
-                                if self.resume:
-                                    cur = self.db._conn.cursor()
-                                    cur.execute("SELECT size,mtime FROM files WHERE path=?", (entry.path,))
-                                    row = cur.fetchone()
-                                    if row and row[0] == st.st_size and row[1] == st.st_mtime:
-                                        continue
-                                # 处理文件（可并发计算 hash，这里为了简化采用当前线程处理）
-                                meta = self.process_file(entry.path, st)
-                                if meta:
-                                    processed_files += 1
+                            if not entry.is_file(follow_symlinks=self.follow_symlinks):
+                                continue
+                            if self.should_skip_by_name(entry.name):
+                                continue
+                            st = self._entry_stat(entry)
+                            if st is None:
+                                continue
+                            # resume 快速跳过
+                            if self.resume and self._resume_index.get(entry.path) == (st.st_size, st.st_mtime):
+                                continue
+                            # 处理文件（大文件的哈希交给 hash_pool）
+                            row = self.process_file(entry.path, st)
+                            if row:
+                                processed_files += 1
+                        except OSError as e:
+                            logger.debug("skip entry: %s -> %s", entry.path, e)
                     # end for entries
             except PermissionError as e:
                 logger.warning("Permission denied scanning %s: %s", dirpath, e)
@@ -362,8 +679,6 @@ class NASScanner:
                 logger.debug("Dir vanished while scanning: %s", dirpath)
             except OSError as e:
                 logger.warning("OSError scanning %s: %s", dirpath, e)
-            finally:
-                self.dir_queue.task_done()
         return processed_files
 
 # ------- CLI -------
@@ -373,7 +688,18 @@ def parse_args():
     p.add_argument("--db", default="nas_scan.db", help="SQLite DB 文件（默认 nas_scan.db）")
     p.add_argument("--follow-symlinks", action="store_true", help="跟随符号链接（小心环路）")
     p.add_argument("--hash", action="store_true", dest="compute_hash", help="计算 SHA256 校验和（可能很慢）")
-    p.add_argument("--threads", type=int, default=8, help="并发线程数（默认 8）")
+    p.add_argument(
+        "--two-pass",
+        action="store_true",
+        help="先遍历，再只对大小相同的文件计算 SHA256（隐含 --hash，适合查找重复文件）",
+    )
+    p.add_argument("--threads", type=int, default=8, help="哈希计算线程数（默认 8）")
+    p.add_argument(
+        "--io-threads",
+        type=int,
+        default=DEFAULT_IO_THREADS,
+        help=f"目录遍历/stat 并发线程数，高延迟的 NAS 上可调大（默认 {DEFAULT_IO_THREADS}）",
+    )
     p.add_argument("--pattern", help="文件名 glob 模式过滤，例如 '*.mp4'")
     p.add_argument("--min-size", type=int, default=0, help="最小文件大小过滤（字节）")
     p.add_argument("--max-size", type=int, default=None, help="最大文件大小过滤（字节）")
@@ -386,12 +712,14 @@ def main():
         root=args.root,
         dbpath=args.db,
         follow_symlinks=args.follow_symlinks,
-        compute_hash=args.compute_hash,
+        compute_hash=args.compute_hash or args.two_pass,
         threads=args.threads,
+        io_threads=args.io_threads,
         pattern=args.pattern,
         min_size=args.min_size,
         max_size=args.max_size,
         resume=not args.no_resume,
+        two_pass=args.two_pass,
     )
 
     start = time.time()
@@ -412,6 +740,7 @@ def main():
                 logger.info("SHA256=%s (%d files)", sha, len(items))
         else:
             logger.info("未发现重复文件（基于已计算的 SHA256）")
+        scanner.db.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
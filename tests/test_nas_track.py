@@ -0,0 +1,400 @@
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import mimetypes
+import threading
+from collections import deque
+from pathlib import Path
+
+import pytest
+
+import nas_track
+
+
+def _row(path: str, dev: int = 1, inode: int = 1) -> nas_track.FileRow:
+    return nas_track.FileRow(
+        path, 1, 0.0, 0.0, 0.0, 0o100644, 0, 0, dev, inode, None, "text/plain", 0.0
+    )
+
+
+def _stored_paths(db: nas_track.DB) -> list:
+    return sorted(path for (path,) in db.reader().execute("SELECT path FROM files"))
+
+
+def _flush_with_deadline(db: nas_track.DB, seconds: float = 10.0) -> bool:
+    result = []
+    flusher = threading.Thread(target=lambda: result.append(db.flush()), daemon=True)
+    flusher.start()
+    flusher.join(seconds)
+    assert not flusher.is_alive(), "DB.flush() hung"
+    return result[0]
+
+
+
+def test_writer_thread_survives_unexpected_errors(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    db = nas_track.DB(str(tmp_path / "scan.db"), batch_size=2)
+    try:
+        write_rows = db._write_rows
+        monkeypatch.setattr(db, "_write_rows", lambda rows: 1 / 0)
+        db.add_file(_row("/nas/lost1"))
+        db.add_file(_row("/nas/lost2"))
+        assert _flush_with_deadline(db)
+        assert db._writer.is_alive()
+        monkeypatch.setattr(db, "_write_rows", write_rows)
+        db.add_file(_row("/nas/kept"))
+        assert _flush_with_deadline(db)
+        assert _stored_paths(db) == ["/nas/kept"]
+    finally:
+        db.close()
+
+def _build_tree(root: Path) -> None:
+    (root / "a" / "deep").mkdir(parents=True)
+    (root / "b").mkdir()
+    (root / "a" / "same1.bin").write_bytes(b"same")
+    (root / "b" / "same2.bin").write_bytes(b"same")
+    (root / "a" / "deep" / "other.bin").write_bytes(b"diff")
+    (root / "unique.txt").write_text("only one of this size")
+
+
+def _scan(root: Path, dbpath: Path, **options: object) -> dict:
+    options = {"threads": 2, "io_threads": 4, **options}
+    scanner = nas_track.NASScanner(str(root), dbpath=str(dbpath), **options)
+    try:
+        scanner.scan()
+        dup = scanner.db.find_duplicates()
+        rows = scanner.db.reader().execute("SELECT path, sha256, scanned_at FROM files")
+        files = {path: (sha256, scanned_at) for path, sha256, scanned_at in rows}
+    finally:
+        scanner.db.close()
+    return {"dup": dup, "files": files, "scanned_at": scanner.scanned_at}
+
+
+def test_batch_keeps_rows_around_one_sqlite_cannot_store(tmp_path: Path) -> None:
+    db = nas_track.DB(str(tmp_path / "scan.db"), batch_size=4)
+    try:
+        db.add_file(_row("/nas/ok1"))
+        db.add_file(_row("/nas/\udcd6\udcd0.txt"))  # GBK name decoded with surrogateescape
+        db.add_file(_row("/nas/big-inode", dev=1 << 64, inode=1 << 64))
+        db.add_file(_row("/nas/ok2"))
+        db.add_file(_row("/nas/ok3"))
+        assert _flush_with_deadline(db)
+        assert _stored_paths(db) == ["/nas/ok1", "/nas/ok2", "/nas/ok3"]
+    finally:
+        db.close()
+
+
+def test_scan_records_every_file(tmp_path: Path) -> None:
+    root = tmp_path / "nas"
+    _build_tree(root)
+    result = _scan(root, tmp_path / "scan.db")
+    assert sorted(Path(path).name for path in result["files"]) == [
+        "other.bin",
+        "same1.bin",
+        "same2.bin",
+        "unique.txt",
+    ]
+
+
+def test_db_connection_uses_wal_and_tuned_pragmas(tmp_path: Path) -> None:
+    db = nas_track.DB(str(tmp_path / "scan.db"))
+    try:
+        conn = db.reader()
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    finally:
+        db.close()
+
+
+def test_resume_skips_unchanged_files(tmp_path: Path) -> None:
+    root = tmp_path / "nas"
+    _build_tree(root)
+    dbpath = tmp_path / "scan.db"
+    first = _scan(root, dbpath, compute_hash=True)
+    changed = root / "unique.txt"
+    changed.write_text("now a different size")
+    second = _scan(root, dbpath, compute_hash=True)
+    rescanned = sorted(
+        Path(path).name
+        for path, (_, scanned_at) in second["files"].items()
+        if scanned_at == second["scanned_at"]
+    )
+    assert rescanned == ["unique.txt"]
+    assert second["files"][str(changed)][0] != first["files"][str(changed)][0]
+
+
+def test_scan_records_stat_of_each_file(tmp_path: Path) -> None:
+    root = tmp_path / "nas"
+    _build_tree(root)
+    dbpath = tmp_path / "scan.db"
+    _scan(root, dbpath)
+    db = nas_track.DB(str(dbpath))
+    try:
+        rows = db.reader().execute("SELECT path, size, mtime, inode FROM files").fetchall()
+    finally:
+        db.close()
+    assert len(rows) == 4
+    for path, size, mtime, inode in rows:
+        st = Path(path).stat()
+        assert (size, mtime, inode) == (st.st_size, st.st_mtime, st.st_ino)
+
+
+def test_sha256_file_matches_hashlib_for_every_read_path(tmp_path: Path) -> None:
+    sizes = [0, 100, nas_track.HASH_MMAP_THRESHOLD + 12345]  # empty, one read(), mmap
+    for size in sizes:
+        data = bytes(range(256)) * (size // 256) + b"x" * (size % 256)
+        path = tmp_path / f"{size}.bin"
+        path.write_bytes(data)
+        assert nas_track.sha256_file(str(path)) == hashlib.sha256(data).hexdigest()
+    assert nas_track.sha256_file(str(tmp_path / "missing.bin")) is None
+
+
+EXPECTED_DUPLICATES = [["big1.dat", "big2.dat"], ["same1.bin", "same2.bin"]]
+
+
+def _add_large_duplicates(root: Path) -> bytes:
+    big = bytes(range(256)) * (nas_track.HASH_INLINE_MAX // 256 + 1)  # hashed on the pool
+    (root / "big1.dat").write_bytes(big)
+    (root / "b" / "big2.dat").write_bytes(big)
+    return big
+
+
+def _duplicate_groups(dup: dict) -> list:
+    return sorted(sorted(Path(path).name for path, _, _ in items) for items in dup.values())
+
+
+def test_scan_hashes_large_files_on_the_pool_and_reports_duplicates(tmp_path: Path) -> None:
+    root = tmp_path / "nas"
+    _build_tree(root)
+    big = _add_large_duplicates(root)
+    result = _scan(root, tmp_path / "scan.db", compute_hash=True)
+    assert len(result["files"]) == 6
+    assert all(sha256 is not None for sha256, _ in result["files"].values())
+    big_sha = hashlib.sha256(big).hexdigest()
+    assert result["files"][str(root / "big1.dat")][0] == big_sha
+    assert _duplicate_groups(result["dup"]) == EXPECTED_DUPLICATES
+
+
+def test_idle_walker_steals_the_directory_nearest_the_root(tmp_path: Path) -> None:
+    scanner = nas_track.NASScanner(str(tmp_path), dbpath=str(tmp_path / "scan.db"), threads=2)
+    try:
+        # Owners push on the head, so a peer's tail holds its shallowest directory.
+        scanner._dir_deques = [deque(), deque(["/nas/a/b/c", "/nas/a"])]
+        assert scanner._next_dir(0) == "/nas/a"
+        assert scanner._next_dir(1) == "/nas/a/b/c"
+    finally:
+        scanner.db.close()
+
+
+def test_walkers_stop_once_every_deque_is_empty(tmp_path: Path) -> None:
+    scanner = nas_track.NASScanner(str(tmp_path), dbpath=str(tmp_path / "scan.db"), threads=3)
+    try:
+        scanner._dir_deques = [deque(), deque(), deque()]
+        results = []
+        walkers = [
+            threading.Thread(target=lambda i=i: results.append(scanner._next_dir(i)), daemon=True)
+            for i in range(3)
+        ]
+        for walker in walkers:
+            walker.start()
+        for walker in walkers:
+            walker.join(10)
+        assert not any(walker.is_alive() for walker in walkers), "walker never terminated"
+        assert results == [None, None, None]
+    finally:
+        scanner.db.close()
+
+
+@pytest.mark.parametrize("io_threads", [1, 8])
+def test_scan_walks_wide_and_deep_trees(tmp_path: Path, io_threads: int) -> None:
+    root = tmp_path / "nas"
+    expected = []
+    for top in range(6):
+        for middle in range(4):
+            leaf = root / f"t{top}" / f"m{middle}" / "leaf"
+            leaf.mkdir(parents=True)
+            for index in range(3):
+                (leaf / f"f{index}.txt").write_text(f"{top}{middle}{index}")
+                expected.append(str(leaf / f"f{index}.txt"))
+    (root / "t0" / "loop").symlink_to(root, target_is_directory=True)
+    result = _scan(root, tmp_path / "scan.db", io_threads=io_threads, follow_symlinks=True)
+    assert sorted(result["files"]) == sorted(expected)
+
+
+def test_process_file_returns_a_row_in_upsert_column_order(tmp_path: Path) -> None:
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n")
+    st = path.stat()
+    scanner = nas_track.NASScanner(str(tmp_path), dbpath=str(tmp_path / "scan.db"))
+    try:
+        row = scanner.process_file(str(path), st)
+        assert isinstance(row, nas_track.FileRow)
+        stat_fields = (st.st_size, st.st_mtime, st.st_atime, st.st_ctime, st.st_mode)
+        owner_fields = (st.st_uid, st.st_gid, st.st_dev, st.st_ino)
+        tail = (None, "text/csv", scanner.scanned_at)
+        assert row == (str(path), *stat_fields, *owner_fields, *tail)
+        # upsert_file still accepts the old dict form.
+        scanner.db.upsert_file(row._replace(path="/nas/copy.csv")._asdict())
+        assert _stored_paths(scanner.db) == ["/nas/copy.csv", str(path)]
+    finally:
+        scanner.db.close()
+
+
+def test_filtered_scan_stats_only_directories_and_matching_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    root = tmp_path / "nas"
+    (root / "videos").mkdir(parents=True)
+    (root / "videos" / "clip.mp4").write_bytes(b"mp4")
+    for index in range(5):
+        (root / "videos" / f"note{index}.txt").write_text("skip me")
+    scanner = nas_track.NASScanner(
+        str(root), dbpath=str(tmp_path / "scan.db"), threads=2, pattern="*.mp4"
+    )
+    statted = []
+    entry_stat = scanner._entry_stat
+    monkeypatch.setattr(
+        scanner, "_entry_stat", lambda entry: statted.append(entry.name) or entry_stat(entry)
+    )
+    try:
+        scanner.scan()
+        assert sorted(_stored_paths(scanner.db)) == [str(root / "videos" / "clip.mp4")]
+    finally:
+        scanner.db.close()
+    assert sorted(statted) == ["clip.mp4", "videos"]
+
+
+@pytest.mark.skipif(not hasattr(nas_track.os, "posix_fadvise"), reason="needs posix_fadvise")
+def test_sha256_file_drops_page_cache_of_large_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    advice = []
+    fadvise = nas_track.os.posix_fadvise
+    monkeypatch.setattr(
+        nas_track.os,
+        "posix_fadvise",
+        lambda fd, offset, length, flag: advice.append(flag) or fadvise(fd, offset, length, flag),
+    )
+    small = tmp_path / "small.bin"
+    small.write_bytes(b"x" * 100)
+    nas_track.sha256_file(str(small))
+    assert advice == []
+    large = tmp_path / "large.bin"
+    large.write_bytes(b"x" * nas_track.HASH_MMAP_THRESHOLD)
+    nas_track.sha256_file(str(large))
+    assert advice == [nas_track.os.POSIX_FADV_SEQUENTIAL, nas_track.os.POSIX_FADV_DONTNEED]
+
+
+@pytest.mark.parametrize("pattern", ["*.mp4", "f1*", "[a-c]?.txt", "*"])
+def test_compiled_name_pattern_matches_like_fnmatch(pattern: str) -> None:
+    compiled = nas_track.compile_name_pattern(pattern)
+    for name in ["a.mp4", "x.MP4", "f10.txt", "b1.txt", "f1", ".hidden", "a\nb.mp4"]:
+        assert (compiled.match(name) is not None) == fnmatch.fnmatch(name, pattern)
+
+
+def test_mark_visited_reports_each_device_inode_once(tmp_path: Path) -> None:
+    scanner = nas_track.NASScanner(str(tmp_path), dbpath=str(tmp_path / "scan.db"))
+    try:
+        # stat_result fields start with (st_mode, st_ino, st_dev, ...)
+        first = nas_track.os.stat_result((0o40755, 7, 3) + (0,) * 7)
+        same_shard = nas_track.os.stat_result((0o40755, 7 + nas_track.VISITED_SHARDS, 3) + (0,) * 7)
+        assert scanner.mark_visited(first)
+        assert not scanner.mark_visited(first)
+        assert scanner.mark_visited(same_shard)
+        assert sum(len(shard) for shard in scanner._visited_shards) == 2
+    finally:
+        scanner.db.close()
+
+
+def test_guess_mime_by_suffix_matches_mimetypes() -> None:
+    names = ["a.mp4", "A.MP4", "x.tar.gz", "y.tgz", "z.svgz", ".bashrc", "noext", "a.b.c.txt"]
+    for name in names + ["dir.d/file", "m.tar.bz2", "q.gz", "a.py.xz"]:
+        path = "/mnt/nas/" + name
+        expected = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        assert nas_track.guess_mime(path) == expected, name
+
+
+def test_io_threads_size_the_walkers_independently_of_hash_threads(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    scanner = nas_track.NASScanner(str(tmp_path), dbpath=str(tmp_path / "scan.db"), threads=2)
+    try:
+        assert (scanner.threads, scanner.io_threads) == (2, nas_track.DEFAULT_IO_THREADS)
+    finally:
+        scanner.db.close()
+    argv = ["nas_track.py", "/nas", "--threads", "2", "--io-threads", "64"]
+    monkeypatch.setattr("sys.argv", argv)
+    args = nas_track.parse_args()
+    assert (args.threads, args.io_threads) == (2, 64)
+
+
+def test_find_duplicates_groups_rows_by_checksum(tmp_path: Path) -> None:
+    db = nas_track.DB(str(tmp_path / "scan.db"))
+    try:
+        db.upsert_files_batch(
+            [
+                _row("/nas/b", inode=2)._replace(sha256="aa", mtime=2.0),
+                _row("/nas/a", inode=1)._replace(sha256="aa", mtime=1.0),
+                _row("/nas/c", inode=3)._replace(sha256="bb"),
+                _row("/nas/d", inode=4),
+                _row("/nas/e", inode=5),
+            ]
+        )
+        assert db.find_duplicates() == {"aa": [("/nas/a", 1, 1.0), ("/nas/b", 1, 2.0)]}
+    finally:
+        db.close()
+
+
+def test_two_pass_hashes_only_files_with_colliding_sizes(tmp_path: Path) -> None:
+    root = tmp_path / "nas"
+    _build_tree(root)
+    _add_large_duplicates(root)
+    result = _scan(root, tmp_path / "scan.db", compute_hash=True, two_pass=True)
+    hashed = sorted(Path(path).name for path, (sha256, _) in result["files"].items() if sha256)
+    assert hashed == ["big1.dat", "big2.dat", "other.bin", "same1.bin", "same2.bin"]
+    assert _duplicate_groups(result["dup"]) == EXPECTED_DUPLICATES
+
+
+def test_two_pass_ignores_rows_from_other_roots(tmp_path: Path) -> None:
+    first = tmp_path / "first"
+    first.mkdir()
+    (first / "x.bin").write_bytes(b"1234")
+    second = tmp_path / "second"
+    second.mkdir()
+    (second / "y.bin").write_bytes(b"5678")
+    dbpath = tmp_path / "scan.db"
+    _scan(first, dbpath, compute_hash=True, two_pass=True)
+    result = _scan(second, dbpath, compute_hash=True, two_pass=True)
+    assert all(sha256 is None for sha256, _ in result["files"].values())
+
+
+def test_sha256_updates_survive_a_failing_row_in_the_same_batch(tmp_path: Path) -> None:
+    db = nas_track.DB(str(tmp_path / "scan.db"), batch_size=3)
+    try:
+        db.add_file(_row("/nas/a"))
+        assert _flush_with_deadline(db)
+        db.add_file(_row("/nas/\udcd6\udcd0.txt"))
+        db.set_sha256("/nas/a", "aa")
+        assert _flush_with_deadline(db)
+        rows = db.reader().execute("SELECT path, sha256 FROM files").fetchall()
+        assert rows == [("/nas/a", "aa")]
+    finally:
+        db.close()
+
+
+def test_writer_batches_run_in_explicit_transactions(tmp_path: Path) -> None:
+    db = nas_track.DB(str(tmp_path / "scan.db"), batch_size=2)
+    try:
+        assert db._writer_conn.isolation_level is None
+        db.add_file(_row("/nas/a"))
+        db.add_file(_row("/nas/b", dev=1 << 64))  # fails the batch, retried row by row
+        db.add_file(_row("/nas/c"))
+        assert _flush_with_deadline(db)
+        assert not db._writer_conn.in_transaction
+        assert _stored_paths(db) == ["/nas/a", "/nas/c"]
+    finally:
+        db.close()